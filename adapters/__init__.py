@@ -1,11 +1,27 @@
-from typing import List
+from importlib import import_module
+from typing import Any, Dict, List, Optional
 
+from .adapter_registry import AdapterRegistry
 from .base_adapter import BaseAdapter
-from .docx_adapter import DocxAdapter
-from .faiss_adapter import FaissAdapter
-from .pdf_adapter import PdfAdapter
+
+_LAZY_EXPORTS: Dict[str, str] = {
+    "DocxAdapter": ".docx_adapter",
+    "FaissAdapter": ".faiss_adapter",
+    "PdfAdapter": ".pdf_adapter",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name: Optional[str] = _LAZY_EXPORTS.get(name)
+    if not module_name:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value: Any = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__: List[str] = [
+    "AdapterRegistry",
     "BaseAdapter",
     "DocxAdapter",
     "FaissAdapter",
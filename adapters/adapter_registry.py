@@ -0,0 +1,57 @@
+import logging
+from importlib import import_module
+from logging import Logger
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .base_adapter import BaseAdapter
+
+logger: Logger = logging.getLogger(__name__)
+
+
+class AdapterRegistry:
+
+    DEFAULT_BACKENDS: Dict[str, Tuple[str, str]] = {
+        ".pdf": ("adapters.pdf_adapter", "PdfAdapter"),
+        ".docx": ("adapters.docx_adapter", "DocxAdapter"),
+    }
+
+    def __init__(self, backends: Optional[Dict[str, Tuple[str, str]]] = None) -> None:
+        self._backends: Dict[str, Tuple[str, str]] = dict(
+            self.DEFAULT_BACKENDS if backends is None else backends
+        )
+        self._instances: Dict[str, BaseAdapter] = {}
+
+    def register(self, extension: str, module_name: str, class_name: str) -> None:
+        extension = extension.lower()
+        self._backends[extension] = (module_name, class_name)
+        self._instances.pop(extension, None)
+
+    def extensions(self) -> List[str]:
+        return list(self._backends.keys())
+
+    def loaded_extensions(self) -> List[str]:
+        return list(self._instances.keys())
+
+    def supports(self, file_path: str) -> bool:
+        return Path(file_path).suffix.lower() in self._backends
+
+    def get(self, extension: str) -> BaseAdapter:
+        extension = extension.lower()
+        adapter: Optional[BaseAdapter] = self._instances.get(extension)
+        if adapter:
+            return adapter
+
+        backend: Optional[Tuple[str, str]] = self._backends.get(extension)
+        if not backend:
+            raise ValueError(f"Nenhum adapter registrado para a extensão '{extension}'")
+
+        module_name, class_name = backend
+        logger.debug(f"Carregando adapter {class_name} para '{extension}'")
+        adapter_cls = getattr(import_module(module_name), class_name)
+        adapter = adapter_cls()
+        self._instances[extension] = adapter
+        return adapter
+
+    def for_file(self, file_path: str) -> BaseAdapter:
+        return self.get(Path(file_path).suffix)
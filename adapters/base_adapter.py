@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 
+from custom_types.ingested_file import IngestedFile
 from custom_types.path_like import PathLike
 
 
@@ -8,3 +9,6 @@ class BaseAdapter(ABC):
     @abstractmethod
     def read_text(self, file_path: PathLike) -> str:
         pass
+
+    async def read_ingested(self, document: IngestedFile) -> str:
+        return await self.read_text(document.file_path)
@@ -3,23 +3,55 @@ from typing import List
 
 import asyncio
 import re
-from typing import List
+from typing import BinaryIO, List, Optional, Union
 from asyncio.events import AbstractEventLoop
 
 from docx import Document as DocxDocument
 
+from custom_types.cancellation_token import CancellationToken
+from custom_types.ingested_file import IngestedFile
+from exceptions import OperationCancelledError
+from utils.cancellation_util import run_cancellable
 from .base_adapter import BaseAdapter
 
 
+_PARAGRAPH_BATCH: int = 200
+
+
+def _extract_docx_text(
+    source: Union[str, BinaryIO], token: Optional[CancellationToken] = None
+) -> str:
+    if token:
+        token.raise_if_cancelled()
+    # A python-docx analisa o XML inteiro nesta chamada, que não pode ser interrompida:
+    # o cancelamento só é observado antes dela e entre lotes de parágrafos.
+    doc: DocxDocument = DocxDocument(source)
+
+    full_text: List[str] = []
+    for index, para in enumerate(doc.paragraphs):
+        if token and index % _PARAGRAPH_BATCH == 0:
+            token.raise_if_cancelled()
+        full_text.append(para.text)
+    return "\n".join(full_text)
+
+
 def _read_docx_file(file_path: str) -> str:
     try:
-        doc: DocxDocument = DocxDocument(file_path)
-        full_text: List[str] = [para.text for para in doc.paragraphs]
-        return "\n".join(full_text)
+        return _extract_docx_text(file_path)
     except Exception as e:
         raise IOError(f"Erro ao ler o arquivo DOCX '{file_path}': {e}")
 
 
+def _read_docx_ingested(document: IngestedFile, token: Optional[CancellationToken] = None) -> str:
+    try:
+        with document.open_stream() as stream:
+            return _extract_docx_text(stream, token)
+    except OperationCancelledError:
+        raise
+    except Exception as e:
+        raise IOError(f"Erro ao ler o arquivo DOCX '{document.file_path}': {e}")
+
+
 class DocxAdapter(BaseAdapter):
 
     def chunk(self, text: str) -> List[str]:
@@ -33,6 +65,10 @@ class DocxAdapter(BaseAdapter):
         text: str = await loop.run_in_executor(None, _read_docx_file, file_path)
         return text
 
+    async def read_ingested(self, document: IngestedFile) -> str:
+        text: str = await run_cancellable(_read_docx_ingested, document)
+        return text
+
 
 if __name__ == "__main__":
     adapter: DocxAdapter = DocxAdapter()
@@ -1,17 +1,65 @@
-from typing import List
+import hashlib
+import json
+import logging
+import os
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+from logging import Logger
+from typing import Dict, FrozenSet, Hashable, List, Optional, Sequence, Set, Tuple, Union
 
 import faiss
-from faiss import IndexFlatL2
+import numpy as np
 
+from custom_types.chunk_record import ChunkRecord
+from custom_types.embed_function import EmbedFunction
+from custom_types.search_hit import SearchHit
 from .base_adapter import BaseAdapter
 
+logger: Logger = logging.getLogger(__name__)
+
+DEFAULT_DOCUMENT_ID: str = "__default__"
+
+_SNAPSHOT_MAGIC: bytes = b"FAISSNAP1"
+_ID_MASK: int = 0x7FFF_FFFF_FFFF_FFFF
+
 
 class FaissAdapter(BaseAdapter):
-    def __init__(self, embedding_dim: int = 384) -> None:
+    def __init__(
+        self,
+        embedding_dim: int = 384,
+        compaction_ratio: float = 0.2,
+        embed_fn: Optional[EmbedFunction] = None,
+        search_threads: int = 0,
+        cache_size: int = 1024,
+    ) -> None:
         super().__init__()
         self.embedding_dim: int = embedding_dim
-        self.index: IndexFlatL2 = faiss.IndexFlatL2(self.embedding_dim)
+        self.compaction_ratio: float = compaction_ratio
+        self.embed_fn: Optional[EmbedFunction] = embed_fn
+        self.cache_size: int = cache_size
+        self.index: faiss.IndexIDMap2 = self._new_index()
         self.chunks: List[str] = []
+        self.version: int = 0
+
+        self._records: Dict[int, ChunkRecord] = {}
+        self._document_ids: Dict[str, Set[int]] = {}
+        self._tombstones: Set[int] = set()
+        self._lock: threading.RLock = threading.RLock()
+        self._compaction_lock: threading.Lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+        # Durante a compactação o índice base só é lido; inserções vão para este índice auxiliar.
+        self._delta: Optional[faiss.IndexIDMap2] = None
+        self._compacting: FrozenSet[int] = frozenset()
+        self._cache: OrderedDict[Hashable, List[SearchHit]] = OrderedDict()
+        self._cache_version: int = 0
+        self._cache_hits: int = 0
+        self._cache_misses: int = 0
+        self._selectors: Dict[Tuple[int, bool], Tuple[faiss.SearchParameters, faiss.IDSelector]] = {}
+
+        if search_threads > 0:
+            self.set_search_threads(search_threads)
 
     def read_text(self, parts: List[str]) -> str:
         return "\n".join(parts)
@@ -25,11 +73,448 @@ class FaissAdapter(BaseAdapter):
             chunks.append(chunk)
         return chunks
 
+    @property
+    def document_count(self) -> int:
+        return len(self._document_ids)
+
+    @property
+    def live_count(self) -> int:
+        return len(self._records)
+
+    @property
+    def tombstone_count(self) -> int:
+        return len(self._tombstones)
+
+    def document_chunks(self, document_id: str) -> List[ChunkRecord]:
+        with self._lock:
+            ids: Set[int] = self._document_ids.get(document_id, set())
+            return sorted((self._records[i] for i in ids), key=lambda record: record.chunk_index)
+
+    @staticmethod
+    def chunk_id(document_id: str, chunk_index: int, text: str) -> int:
+        digest: bytes = hashlib.blake2b(
+            f"{document_id}\x00{chunk_index}\x00{text}".encode("utf-8"), digest_size=8
+        ).digest()
+        # IDs da FAISS são int64 com -1 reservado: mantém apenas 63 bits.
+        return int.from_bytes(digest, "big") & _ID_MASK
+
     def add_embeddings(self, embeddings) -> None:
-        self.index.add(embeddings)
+        vectors: np.ndarray = self._as_matrix(embeddings)
+        with self._lock:
+            start: int = len(self._document_ids.get(DEFAULT_DOCUMENT_ID, ()))
+            texts: List[str] = [
+                self.chunks[start + i] if start + i < len(self.chunks) else ""
+                for i in range(len(vectors))
+            ]
+            self._insert(DEFAULT_DOCUMENT_ID, texts, vectors, start)
+
+    def upsert_document(self, document_id: str, chunks: List[str], embeddings) -> int:
+        vectors: np.ndarray = self._as_matrix(embeddings)
+        if len(vectors) != len(chunks):
+            raise ValueError(f"{len(chunks)} chunk(s) para {len(vectors)} embedding(s) em {document_id}")
+
+        with self._lock:
+            previous: Set[int] = set(self._document_ids.get(document_id, ()))
+            wanted: Dict[int, int] = {
+                self.chunk_id(document_id, index, text): index for index, text in enumerate(chunks)
+            }
+
+            if len(wanted) != len(chunks):
+                raise ValueError(f"Colisão de IDs entre chunks de {document_id}")
+
+            stale: Set[int] = previous - wanted.keys()
+            new_rows: List[int] = [index for chunk_id, index in wanted.items() if chunk_id not in previous]
+            # Insere antes de remover: se houver colisão nada é alterado, e um ID novo nunca
+            # reaproveita o vetor de um chunk antigo recém-marcado para remoção.
+            self._insert(
+                document_id,
+                [chunks[index] for index in new_rows],
+                vectors[new_rows],
+                chunk_indexes=new_rows,
+            )
+            self._tombstone(stale)
+
+            if stale:
+                self.version += 1
+            logger.debug(
+                f"Upsert de {document_id}: {len(new_rows)} novo(s), {len(stale)} removido(s), "
+                f"{len(wanted) - len(new_rows)} inalterado(s)"
+            )
+            changed: int = len(stale) + len(new_rows)
+
+        self._maybe_compact()
+        return changed
+
+    def delete_document(self, document_id: str) -> int:
+        with self._lock:
+            ids: Set[int] = set(self._document_ids.get(document_id, ()))
+            self._tombstone(ids)
+            if ids:
+                self.version += 1
+
+        self._maybe_compact()
+        return len(ids)
+
+    def compact(self) -> int:
+        with self._compaction_lock:
+            with self._lock:
+                if not self._tombstones:
+                    return 0
+                removing: FrozenSet[int] = frozenset(self._tombstones)
+                base: faiss.IndexIDMap2 = self.index
+                self._delta = self._new_index()
+                self._compacting = removing
+
+            # A cópia e a remoção custam O(ntotal) e rodam fora do lock: buscas continuam
+            # lendo o índice base e upserts/deletes seguem gravando no índice auxiliar.
+            try:
+                compacted: faiss.IndexIDMap2 = faiss.clone_index(base)
+                removed: int = compacted.remove_ids(
+                    np.fromiter(removing, dtype=np.int64, count=len(removing))
+                )
+            except BaseException:
+                with self._lock:
+                    self._merge_delta(self.index)
+                raise
+
+            with self._lock:
+                readded: Set[int] = self._merge_delta(compacted)
+                self.index = compacted
+                self._tombstones = {
+                    chunk_id for chunk_id in self._tombstones
+                    if chunk_id not in removing or chunk_id in readded
+                }
+                self.version += 1
+
+        logger.info(f"Compactação do índice removeu {removed} vetor(es)")
+        return removed
+
+    def compact_in_background(self) -> Optional[threading.Thread]:
+        with self._lock:
+            if self._compactor and self._compactor.is_alive():
+                return self._compactor
+            self._compactor = threading.Thread(target=self.compact, name="faiss-compactor", daemon=True)
+            self._compactor.start()
+            return self._compactor
+
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> None:
+        compactor: Optional[threading.Thread] = self._compactor
+        if compactor:
+            compactor.join(timeout)
+
+    @staticmethod
+    def set_search_threads(threads: int) -> None:
+        # A FAISS paraleliza buscas em lote via OpenMP; a configuração vale para o processo todo.
+        faiss.omp_set_num_threads(threads)
+
+    @property
+    def cache_stats(self) -> Dict[str, int]:
+        return {"size": len(self._cache), "hits": self._cache_hits, "misses": self._cache_misses}
+
+    def search(self, queries: Union[np.ndarray, Sequence[str]], k: int = 10) -> List[List[SearchHit]]:
+        if isinstance(queries, str):
+            raise TypeError("Passe uma lista de consultas, não uma única string")
+
+        texts: Optional[List[str]] = None
+        vectors: Optional[np.ndarray] = None
+        if isinstance(queries, np.ndarray):
+            vectors = self._as_matrix(queries)
+            count: int = len(vectors)
+        else:
+            texts = list(queries)
+            count = len(texts)
+            if texts and not all(isinstance(text, str) for text in texts):
+                vectors = self._as_matrix(texts)
+                texts = None
+        if count == 0:
+            return []
+
+        keys: List[Hashable] = [
+            ("text", texts[i], k) if texts is not None else ("vector", vectors[i].tobytes(), k)
+            for i in range(count)
+        ]
+
+        results: List[Optional[List[SearchHit]]] = [None] * count
+        with self._lock:
+            self._sync_cache()
+            missing: List[int] = []
+            for i, key in enumerate(keys):
+                cached: Optional[List[SearchHit]] = self._cache.get(key)
+                if cached is None:
+                    missing.append(i)
+                else:
+                    self._cache.move_to_end(key)
+                    results[i] = list(cached)
+            self._cache_hits += count - len(missing)
+            self._cache_misses += len(missing)
+
+        if missing:
+            if texts is not None:
+                missing_vectors: np.ndarray = self._embed([texts[i] for i in missing])
+            else:
+                missing_vectors = vectors[missing]
+
+            with self._lock:
+                self._sync_cache()
+                found: List[List[SearchHit]] = self._search_vectors(missing_vectors, k)
+                for i, hits in zip(missing, found):
+                    results[i] = hits
+                    self._remember(keys[i], list(hits))
+
+        return results
+
+    def save_snapshot(self, path: str = "index.snapshot") -> None:
+        with self._compaction_lock, self._lock:
+            metadata: bytes = json.dumps(
+                {
+                    "embedding_dim": self.embedding_dim,
+                    "version": self.version,
+                    "records": [record.to_dict() for record in self._records.values()],
+                    "tombstones": sorted(self._tombstones),
+                },
+                ensure_ascii=False,
+            ).encode("utf-8")
+            index_bytes: np.ndarray = faiss.serialize_index(self.index)
+
+        directory: str = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(_SNAPSHOT_MAGIC)
+                file.write(struct.pack("<Q", len(metadata)))
+                file.write(metadata)
+                file.write(index_bytes.tobytes())
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+        # Garante que a renomeação sobreviva a uma queda do sistema.
+        dir_fd: int = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    def load_snapshot(self, path: str = "index.snapshot") -> None:
+        with open(path, "rb") as file:
+            if file.read(len(_SNAPSHOT_MAGIC)) != _SNAPSHOT_MAGIC:
+                raise ValueError(f"Arquivo não é um snapshot de índice válido: {path}")
+            (metadata_size,) = struct.unpack("<Q", file.read(8))
+            metadata = json.loads(file.read(metadata_size).decode("utf-8"))
+            index_bytes: np.ndarray = np.frombuffer(file.read(), dtype=np.uint8)
+
+        index = faiss.deserialize_index(index_bytes)
+        records: Dict[int, ChunkRecord] = {}
+        document_ids: Dict[str, Set[int]] = {}
+        for data in metadata["records"]:
+            record: ChunkRecord = ChunkRecord.from_dict(data)
+            records[record.chunk_id] = record
+            document_ids.setdefault(record.document_id, set()).add(record.chunk_id)
+
+        with self._compaction_lock, self._lock:
+            self.embedding_dim = metadata["embedding_dim"]
+            self.index = index
+            self._records = records
+            self._document_ids = document_ids
+            self._tombstones = set(metadata["tombstones"])
+            # A versão só avança: a do snapshot pode ser menor ou igual à atual, o que
+            # reaproveitaria resultados e seletores calculados para o índice anterior.
+            self.version = max(self.version, metadata["version"]) + 1
+            self._reset_caches()
 
     def save_index(self, path: str = "index.faiss") -> None:
         faiss.write_index(self.index, path)
 
     def load_index(self, path: str = "index.faiss") -> None:
-        self.index = faiss.read_index(path)
+        index = faiss.read_index(path)
+        if isinstance(index, faiss.IndexIDMap2):
+            # Sem os metadados dos chunks o índice não pode ser reconciliado com os documentos.
+            raise ValueError(
+                f"'{path}' é um índice com IDs sem metadados dos chunks; use load_snapshot()"
+            )
+
+        # Índices antigos eram posicionais: adota as posições como IDs.
+        vectors: np.ndarray = index.reconstruct_n(0, index.ntotal) if index.ntotal else np.empty(
+            (0, index.d), dtype=np.float32
+        )
+        with self._compaction_lock, self._lock:
+            self.embedding_dim = index.d
+            self.index = self._new_index()
+            self._records.clear()
+            self._document_ids.clear()
+            self._tombstones.clear()
+            self.version += 1
+            self._reset_caches()
+            self.add_embeddings(vectors)
+
+    def _search_vectors(self, vectors: np.ndarray, k: int) -> List[List[SearchHit]]:
+        sources: List[Tuple[faiss.IndexIDMap2, bool]] = [
+            (index, is_base)
+            for index, is_base in ((self.index, True), (self._delta, False))
+            if index is not None and index.ntotal
+        ]
+        if not sources or k <= 0:
+            return [[] for _ in range(len(vectors))]
+
+        found: List[Tuple[np.ndarray, np.ndarray]] = [
+            index.search(vectors, min(k, index.ntotal), params=self._search_params(is_base))
+            for index, is_base in sources
+        ]
+        distances: np.ndarray = np.hstack([pair[0] for pair in found])
+        ids: np.ndarray = np.hstack([pair[1] for pair in found])
+        if len(found) > 1:
+            order: np.ndarray = np.argsort(distances, axis=1, kind="stable")
+            distances = np.take_along_axis(distances, order, axis=1)
+            ids = np.take_along_axis(ids, order, axis=1)
+
+        results: List[List[SearchHit]] = []
+        for row_distances, row_ids in zip(distances, ids):
+            hits: List[SearchHit] = []
+            for distance, chunk_id in zip(row_distances.tolist(), row_ids.tolist()):
+                record: Optional[ChunkRecord] = self._records.get(chunk_id)
+                if record is None:
+                    continue
+                hits.append(SearchHit.from_record(record, distance, len(hits)))
+                if len(hits) == k:
+                    break
+            results.append(hits)
+        return results
+
+    def _search_params(self, is_base: bool) -> Optional[faiss.SearchParameters]:
+        # Vetores marcados para remoção são excluídos dentro da própria FAISS, sem sobrebusca.
+        # No índice base também saem os IDs em compactação, cujas versões novas estão no auxiliar.
+        excluded: Set[int] = self._tombstones | self._compacting if is_base else self._tombstones
+        if not excluded:
+            return None
+
+        key: Tuple[int, bool] = (self.version, is_base)
+        cached: Optional[Tuple[faiss.SearchParameters, faiss.IDSelector]] = self._selectors.get(key)
+        if cached is None:
+            if any(version != self.version for version, _ in self._selectors):
+                self._selectors.clear()
+            ids: np.ndarray = np.fromiter(excluded, dtype=np.int64, count=len(excluded))
+            batch: faiss.IDSelector = faiss.IDSelectorBatch(ids)
+            # O IDSelectorNot guarda só o ponteiro: o seletor interno precisa continuar referenciado.
+            cached = (faiss.SearchParameters(sel=faiss.IDSelectorNot(batch)), batch)
+            self._selectors[key] = cached
+        return cached[0]
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        if self.embed_fn is None:
+            raise ValueError("Consultas em texto exigem um embed_fn configurado no FaissAdapter")
+        return self._as_matrix(self.embed_fn(texts))
+
+    def _sync_cache(self) -> None:
+        if self._cache_version != self.version:
+            self._cache.clear()
+            self._cache_version = self.version
+
+    def _reset_caches(self) -> None:
+        self._cache.clear()
+        self._cache_version = self.version
+        self._selectors.clear()
+
+    def _remember(self, key: Hashable, hits: List[SearchHit]) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = hits
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _new_index(self) -> faiss.IndexIDMap2:
+        return faiss.IndexIDMap2(faiss.IndexFlatL2(self.embedding_dim))
+
+    def _as_matrix(self, embeddings) -> np.ndarray:
+        vectors: np.ndarray = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+        if vectors.shape[1] != self.embedding_dim:
+            raise ValueError(
+                f"Dimensão do embedding ({vectors.shape[1]}) difere da do índice ({self.embedding_dim})"
+            )
+        return vectors
+
+    def _insert(
+        self,
+        document_id: str,
+        texts: List[str],
+        vectors: np.ndarray,
+        start: int = 0,
+        chunk_indexes: Optional[List[int]] = None,
+    ) -> None:
+        indexes: List[int] = chunk_indexes if chunk_indexes is not None else list(range(start, start + len(texts)))
+        ids: List[int] = [self.chunk_id(document_id, index, text) for index, text in zip(indexes, texts)]
+        self._check_collisions(document_id, ids, indexes, texts)
+
+        rows: List[int] = []
+        for row, (chunk_id, index, text) in enumerate(zip(ids, indexes, texts)):
+            # O ID codifica documento, posição e conteúdo: um vetor marcado para remoção
+            # com o mesmo ID é idêntico e pode ser reaproveitado sem tocar no índice.
+            if chunk_id in self._tombstones and chunk_id not in self._compacting:
+                self._tombstones.discard(chunk_id)
+            elif chunk_id not in self._records:
+                # Se a compactação em andamento vai apagar o vetor antigo, grava de novo.
+                self._tombstones.discard(chunk_id)
+                rows.append(row)
+            self._records[chunk_id] = ChunkRecord(chunk_id, document_id, index, text)
+            self._document_ids.setdefault(document_id, set()).add(chunk_id)
+
+        if rows:
+            target: faiss.IndexIDMap2 = self._delta if self._delta is not None else self.index
+            target.add_with_ids(vectors[rows], np.asarray([ids[row] for row in rows], dtype=np.int64))
+        if ids:
+            self.version += 1
+
+    def _check_collisions(
+        self,
+        document_id: str,
+        ids: List[int],
+        indexes: List[int],
+        texts: List[str],
+    ) -> None:
+        if len(set(ids)) != len(ids):
+            raise ValueError(f"Colisão de IDs entre chunks de {document_id}")
+        for chunk_id, index, text in zip(ids, indexes, texts):
+            existing: Optional[ChunkRecord] = self._records.get(chunk_id)
+            if existing is None:
+                continue
+            # Com 63 bits a colisão é improvável, mas sobrescrever o registro trocaria o
+            # texto devolvido pela busca sem que o vetor correspondesse a ele.
+            if (existing.document_id, existing.chunk_index, existing.text) != (document_id, index, text):
+                raise ValueError(
+                    f"Colisão do ID {chunk_id}: chunk {index} de {document_id} e "
+                    f"chunk {existing.chunk_index} de {existing.document_id}"
+                )
+
+    def _merge_delta(self, target: faiss.IndexIDMap2) -> Set[int]:
+        delta: Optional[faiss.IndexIDMap2] = self._delta
+        self._delta = None
+        self._compacting = frozenset()
+        if delta is None or delta.ntotal == 0:
+            return set()
+
+        ids: np.ndarray = faiss.vector_to_array(delta.id_map).astype(np.int64)
+        target.add_with_ids(delta.index.reconstruct_n(0, delta.ntotal), ids)
+        return set(ids.tolist())
+
+    def _tombstone(self, ids: Set[int]) -> None:
+        for chunk_id in ids:
+            record: Optional[ChunkRecord] = self._records.pop(chunk_id, None)
+            if record is None:
+                continue
+            document: Set[int] = self._document_ids.get(record.document_id, set())
+            document.discard(chunk_id)
+            if not document:
+                self._document_ids.pop(record.document_id, None)
+            self._tombstones.add(chunk_id)
+
+    def _maybe_compact(self) -> None:
+        total: int = self.index.ntotal + (self._delta.ntotal if self._delta is not None else 0)
+        if total and len(self._tombstones) / total >= self.compaction_ratio:
+            self.compact_in_background()
@@ -1,21 +1,42 @@
 import asyncio
+from typing import BinaryIO, Optional
 from pypdf import PdfReader
+from custom_types.cancellation_token import CancellationToken
+from custom_types.ingested_file import IngestedFile
+from exceptions import OperationCancelledError
+from utils.cancellation_util import run_cancellable
 from .base_adapter import BaseAdapter
 from asyncio.events import AbstractEventLoop
 
 
+def _extract_pdf_text(stream: BinaryIO, token: Optional[CancellationToken] = None) -> str:
+    text: str = ""
+    reader: PdfReader = PdfReader(stream)
+    for page in reader.pages:
+        if token:
+            token.raise_if_cancelled()
+        text += page.extract_text() or ""
+    return text
+
+
 def _read_pdf_file(file_path: str) -> str:
     try:
-        text: str = ""
         with open(file_path, "rb") as file:
-            reader: PdfReader = PdfReader(file)
-            for page in reader.pages:
-                text += page.extract_text() or ""
-        return text
+            return _extract_pdf_text(file)
     except Exception as e:
         raise IOError(f"Erro ao ler o arquivo PDF '{file_path}': {e}")
 
 
+def _read_pdf_ingested(document: IngestedFile, token: Optional[CancellationToken] = None) -> str:
+    try:
+        with document.open_stream() as stream:
+            return _extract_pdf_text(stream, token)
+    except OperationCancelledError:
+        raise
+    except Exception as e:
+        raise IOError(f"Erro ao ler o arquivo PDF '{document.file_path}': {e}")
+
+
 class PdfAdapter(BaseAdapter):
     def __init__(self) -> None:
         super().__init__()
@@ -25,6 +46,10 @@ class PdfAdapter(BaseAdapter):
         text: str = await loop.run_in_executor(None, _read_pdf_file, file_path)
         return text
 
+    async def read_ingested(self, document: IngestedFile) -> str:
+        text: str = await run_cancellable(_read_pdf_ingested, document)
+        return text
+
 
 if __name__ == "__main__":
     adapter: PdfAdapter = PdfAdapter()
@@ -1,19 +1,36 @@
-from typing import Optional
+from __future__ import annotations
 
-from adapters.faiss_adapter import FaissAdapter
+from typing import TYPE_CHECKING, Optional
+
+from config import SEARCH_CACHE_SIZE, SEARCH_THREADS
 from decorators.injectable_decorator import injectable
 
+if TYPE_CHECKING:
+    from adapters.faiss_adapter import FaissAdapter
+    from custom_types.embed_function import EmbedFunction
+
 @injectable
 class FaissAdapterBuilder:
     def __init__(self) -> None:
         self._text: Optional[str] = None
+        self._embed_fn: Optional[EmbedFunction] = None
 
     def with_text(self, text: str) -> "FaissAdapterBuilder":
         self._text: str = text
         return self
 
+    def with_embed_fn(self, embed_fn: EmbedFunction) -> "FaissAdapterBuilder":
+        self._embed_fn = embed_fn
+        return self
+
     def build(self) -> FaissAdapter:
-        adapter: FaissAdapter = FaissAdapter()
+        from adapters.faiss_adapter import FaissAdapter
+
+        adapter: FaissAdapter = FaissAdapter(
+            embed_fn=self._embed_fn,
+            search_threads=SEARCH_THREADS,
+            cache_size=SEARCH_CACHE_SIZE,
+        )
         if self._text:
             adapter.chunks = adapter.chunk_text(self._text)
         return adapter
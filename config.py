@@ -6,3 +6,31 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "sua_chave_de_api_aqui")
 MODEL_NAME: Literal['text-davinci-003'] = "text-davinci-003"
 
 DATA_DIR: Literal['data'] = "data"
+
+SERVER_HOST: str = os.getenv("SERVER_HOST", "127.0.0.1")
+
+SERVER_PORT: int = int(os.getenv("SERVER_PORT", "8080"))
+
+STARTUP_BUDGET_MS: float = float(os.getenv("STARTUP_BUDGET_MS", "300"))
+
+SMALL_MODEL_NAME: str = os.getenv("SMALL_MODEL_NAME", "gpt-5-mini")
+
+LARGE_MODEL_NAME: str = os.getenv("LARGE_MODEL_NAME", "gpt-5.2")
+
+SMALL_MODEL_MAX_WORDS: int = int(os.getenv("SMALL_MODEL_MAX_WORDS", "400"))
+
+DOCUMENT_TIMEOUT_S: float = float(os.getenv("DOCUMENT_TIMEOUT_S", "0"))
+
+GRACE_PERIOD_S: float = float(os.getenv("GRACE_PERIOD_S", "30"))
+
+SEARCH_THREADS: int = int(os.getenv("SEARCH_THREADS", "0"))
+
+SEARCH_CACHE_SIZE: int = int(os.getenv("SEARCH_CACHE_SIZE", "1024"))
+
+PACK_TOKEN_BUDGET: int = int(os.getenv("PACK_TOKEN_BUDGET", "6000"))
+
+PACK_MAX_DOCUMENT_TOKENS: int = int(os.getenv("PACK_MAX_DOCUMENT_TOKENS", "800"))
+
+PACK_MAX_DOCUMENTS: int = int(os.getenv("PACK_MAX_DOCUMENTS", "20"))
+
+PACK_LINGER_MS: float = float(os.getenv("PACK_LINGER_MS", "50"))
@@ -1,8 +1,27 @@
-from .openai_summarizer import OpenAISummarizer
+from importlib import import_module
+from typing import Any, Dict, List, Optional
+
 from .base_summarizer import BaseSummarizer as Summarizer
-from typing import List
+
+_LAZY_EXPORTS: Dict[str, str] = {
+    "OpenAISummarizer": ".openai_summarizer",
+    "PackingSummarizer": ".packing_summarizer",
+    "RoutingSummarizer": ".routing_summarizer",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name: Optional[str] = _LAZY_EXPORTS.get(name)
+    if not module_name:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value: Any = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__: List[str] = [
     "OpenAISummarizer",
+    "PackingSummarizer",
+    "RoutingSummarizer",
     "Summarizer"
-]
\ No newline at end of file
+]
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator, Callable, List, Optional
 
 
 class BaseSummarizer(ABC):
@@ -6,3 +7,21 @@ class BaseSummarizer(ABC):
     @abstractmethod
     def summarize(self, text: str) -> str:
         pass
+
+    async def summarize_stream(
+        self,
+        text: str,
+        prompt: Optional[str] = None,
+        on_chunk: Optional[Callable[[int, int], None]] = None,
+    ) -> AsyncIterator[str]:
+        summary: str = await self.summarize(text)
+        if on_chunk:
+            on_chunk(1, 1)
+        if summary:
+            yield summary
+
+    async def summarize_many(self, texts: List[str]) -> List[Optional[str]]:
+        return [await self.summarize(text) for text in texts]
+
+    async def close(self) -> None:
+        pass
@@ -1,17 +1,37 @@
+import json
 import logging
 import os
 from logging import Logger
-from typing import Any, Optional, List
+from typing import Any, AsyncIterator, Callable, Dict, Optional, List
 
 import openai
 from openai import AsyncOpenAI
-from openai.types.chat import ChatCompletion
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
 
 from core.base_summarizer import BaseSummarizer
+from enums import SummarizationStage
+from exceptions import PackedResponseError
 from utils.chunck_util import chunk_text
 
 logger: Logger = logging.getLogger(__name__)
 
+DEFAULT_SYSTEM_PROMPT: str = (
+    "Você é um assistente especializado em resumir documentos. "
+    "Sua tarefa é criar um resumo conciso e claro do texto a seguir, "
+    "capturando os pontos principais e as informações mais relevantes."
+)
+
+REDUCE_PROMPT: str = "Combine os resumos a seguir em um único resumo coeso:"
+
+PACK_PROMPT: str = (
+    DEFAULT_SYSTEM_PROMPT
+    + " Você receberá um objeto JSON com a lista \"documents\", cada um com \"id\" e \"text\". "
+    "Resuma cada documento de forma independente e responda apenas com JSON no formato "
+    '{"summaries": [{"id": <id>, "summary": "<resumo>"}]}, com exatamente um item por documento.'
+)
+
+SUMMARY_MAX_TOKENS: int = 250
+
 
 class OpenAISummarizer(BaseSummarizer):
 
@@ -27,6 +47,9 @@ class OpenAISummarizer(BaseSummarizer):
 
         self.client: AsyncOpenAI = AsyncOpenAI(api_key=self.api_key)
 
+    async def close(self) -> None:
+        await self.client.close()
+
     async def summarize(self, text: str, prompt: Optional[str] = None) -> str:
 
         if not text.strip():
@@ -38,13 +61,59 @@ class OpenAISummarizer(BaseSummarizer):
             chunks: List[str] = chunk_text(text)
             
             if len(chunks) == 1:
-                return await self._summarize_chunk(chunks[0], prompt)
+                return await self._summarize_chunk(chunks[0], prompt, SummarizationStage.SINGLE)
 
-            summaries: List[str] = [await self._summarize_chunk(chunk) for chunk in chunks]
+            summaries: List[str] = [
+                await self._summarize_chunk(chunk, stage=SummarizationStage.MAP) for chunk in chunks
+            ]
             
             combined_summaries: str = "\n".join(summaries)
             
-            return await self._summarize_chunk(combined_summaries, "Combine os resumos a seguir em um único resumo coeso:")
+            return await self._summarize_chunk(
+                combined_summaries, REDUCE_PROMPT, SummarizationStage.REDUCE
+            )
+
+        except openai.APIError as e:
+            logger.error(f"Erro na API da OpenAI ao sumarizar: {e}")
+            raise RuntimeError(f"Falha na comunicação com a API da OpenAI: {e}") from e
+        except Exception as e:
+            logger.error(f"Um erro inesperado ocorreu durante a sumarização: {e}")
+            raise RuntimeError(f"Erro inesperado ao gerar resumo: {e}") from e
+
+    async def summarize_stream(
+        self,
+        text: str,
+        prompt: Optional[str] = None,
+        on_chunk: Optional[Callable[[int, int], None]] = None,
+    ) -> AsyncIterator[str]:
+
+        if not text.strip():
+            return
+
+        logger.debug(f"Iniciando sumarização em streaming com o modelo {self.model}.")
+
+        try:
+            chunks: List[str] = chunk_text(text)
+
+            if len(chunks) == 1:
+                async for delta in self._stream_chunk(chunks[0], prompt, SummarizationStage.SINGLE):
+                    yield delta
+                if on_chunk:
+                    on_chunk(1, 1)
+                return
+
+            summaries: List[str] = []
+            for index, chunk in enumerate(chunks):
+                summaries.append(await self._summarize_chunk(chunk, stage=SummarizationStage.MAP))
+                if on_chunk:
+                    on_chunk(index + 1, len(chunks))
+
+            combined_summaries: str = "\n".join(summaries)
+
+            async for delta in self._stream_chunk(
+                combined_summaries, REDUCE_PROMPT, SummarizationStage.REDUCE
+            ):
+                yield delta
 
         except openai.APIError as e:
             logger.error(f"Erro na API da OpenAI ao sumarizar: {e}")
@@ -53,27 +122,125 @@ class OpenAISummarizer(BaseSummarizer):
             logger.error(f"Um erro inesperado ocorreu durante a sumarização: {e}")
             raise RuntimeError(f"Erro inesperado ao gerar resumo: {e}") from e
 
-    async def _summarize_chunk(self, text: str, prompt: Optional[str] = None) -> str:
-        system_prompt: str = prompt or (
-            "Você é um assistente especializado em resumir documentos. "
-            "Sua tarefa é criar um resumo conciso e claro do texto a seguir, "
-            "capturando os pontos principais e as informações mais relevantes."
+    async def summarize_many(self, texts: List[str]) -> List[Optional[str]]:
+        if not texts:
+            return []
+
+        payload: str = json.dumps(
+            {"documents": [{"id": index, "text": text} for index, text in enumerate(texts)]},
+            ensure_ascii=False,
+        )
+        logger.debug(f"Sumarizando {len(texts)} documento(s) em uma única requisição.")
+
+        try:
+            content: str = await self._complete_packed(payload, len(texts))
+        except openai.APIError as e:
+            logger.error(f"Erro na API da OpenAI ao sumarizar em lote: {e}")
+            raise RuntimeError(f"Falha na comunicação com a API da OpenAI: {e}") from e
+
+        return self._parse_packed(content, len(texts))
+
+    async def _complete_packed(self, payload: str, count: int) -> str:
+        response: ChatCompletion = await self._complete(
+            payload, PACK_PROMPT, self.model, **self._packed_params(count)
+        )
+        return self._extract_summary(response)
+
+    @staticmethod
+    def _packed_params(count: int) -> Dict[str, Any]:
+        return dict(
+            max_completion_tokens=SUMMARY_MAX_TOKENS * count,
+            response_format={"type": "json_object"},
         )
 
-        response: ChatCompletion = await self.client.chat.completions.create(
-            model=self.model,
+    @staticmethod
+    def _parse_packed(content: str, count: int) -> List[Optional[str]]:
+        try:
+            data: Any = json.loads(content)
+        except json.JSONDecodeError as e:
+            raise PackedResponseError(f"JSON inválido ({e})", count) from e
+
+        items: Any = data.get("summaries") if isinstance(data, dict) else None
+        if not isinstance(items, list):
+            raise PackedResponseError("campo 'summaries' ausente", count)
+
+        summaries: List[Optional[str]] = [None] * count
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            index: Any = item.get("id")
+            summary: Any = item.get("summary")
+            if isinstance(index, str) and index.isdigit():
+                index = int(index)
+            # Itens desconhecidos ou vazios ficam como None e são refeitos individualmente.
+            if isinstance(index, int) and 0 <= index < count and isinstance(summary, str) and summary.strip():
+                summaries[index] = summary.strip()
+        return summaries
+
+    async def _summarize_chunk(
+        self,
+        text: str,
+        prompt: Optional[str] = None,
+        stage: SummarizationStage = SummarizationStage.SINGLE,
+    ) -> str:
+        response: ChatCompletion = await self._complete(text, prompt, self.model)
+        logger.debug("Sumarização de trecho com OpenAI concluída com sucesso.")
+        return self._extract_summary(response)
+
+    async def _stream_chunk(
+        self,
+        text: str,
+        prompt: Optional[str] = None,
+        stage: SummarizationStage = SummarizationStage.SINGLE,
+    ) -> AsyncIterator[str]:
+        async for chunk in self._stream_complete(text, prompt, self.model):
+            delta: Optional[str] = self._extract_delta(chunk)
+            if delta:
+                yield delta
+
+    async def _complete(
+        self, text: str, prompt: Optional[str], model: str, **overrides: Any
+    ) -> ChatCompletion:
+        return await self.client.chat.completions.create(
+            **{**self._request_params(text, prompt, model), **overrides}
+        )
+
+    async def _stream_complete(
+        self, text: str, prompt: Optional[str], model: str
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        stream: Any = await self.client.chat.completions.create(
+            **self._request_params(text, prompt, model), stream=True
+        )
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.close()
+
+    @staticmethod
+    def _request_params(text: str, prompt: Optional[str], model: str) -> dict:
+        system_prompt: str = prompt or DEFAULT_SYSTEM_PROMPT
+
+        return dict(
+            model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": text},
             ],
             temperature=0.3,
-            max_completion_tokens=250,
+            max_completion_tokens=SUMMARY_MAX_TOKENS,
             top_p=1.0,
             frequency_penalty=0.0,
             presence_penalty=0.0,
         )
 
-        summary: Any = response.choices[0].message.content
-        logger.debug("Sumarização de trecho com OpenAI concluída com sucesso.")
+    @staticmethod
+    def _extract_delta(chunk: ChatCompletionChunk) -> Optional[str]:
+        if not chunk.choices:
+            return None
+        return chunk.choices[0].delta.content
 
-        return summary.strip() if summary else ""
\ No newline at end of file
+    @staticmethod
+    def _extract_summary(response: ChatCompletion) -> str:
+        summary: Any = response.choices[0].message.content
+        return summary.strip() if summary else ""
@@ -0,0 +1,177 @@
+import asyncio
+import logging
+from asyncio import Future, TimerHandle
+from dataclasses import dataclass
+from logging import Logger
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set
+
+from core.base_summarizer import BaseSummarizer
+from exceptions import PackedResponseError
+from utils.chunck_util import estimate_tokens
+
+logger: Logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingDocument:
+    text: str
+    tokens: int
+    future: Future
+
+
+class PackingSummarizer(BaseSummarizer):
+
+    def __init__(
+        self,
+        inner: BaseSummarizer,
+        token_budget: int = 6000,
+        max_document_tokens: int = 800,
+        max_documents: int = 20,
+        linger_ms: float = 50.0,
+    ) -> None:
+        self.inner: BaseSummarizer = inner
+        self.token_budget: int = token_budget
+        self.max_document_tokens: int = max_document_tokens
+        self.max_documents: int = max_documents
+        self.linger_s: float = linger_ms / 1000
+
+        self._pending: List[_PendingDocument] = []
+        self._pending_tokens: int = 0
+        self._timer: Optional[TimerHandle] = None
+        self._requests: Set[asyncio.Task] = set()
+        self._stats: Dict[str, int] = {
+            "packed_requests": 0,
+            "packed_documents": 0,
+            "single_requests": 0,
+            "fallbacks": 0,
+        }
+
+    def can_pack(self, text: str, prompt: Optional[str] = None) -> bool:
+        return prompt is None and bool(text.strip()) and estimate_tokens(text) <= self.max_document_tokens
+
+    async def summarize(self, text: str, prompt: Optional[str] = None) -> str:
+        if not self.can_pack(text, prompt):
+            return await self.inner.summarize(text, prompt)
+        return await self._enqueue(text)
+
+    async def summarize_stream(
+        self,
+        text: str,
+        prompt: Optional[str] = None,
+        on_chunk: Optional[Callable[[int, int], None]] = None,
+    ) -> AsyncIterator[str]:
+        if not self.can_pack(text, prompt):
+            async for delta in self.inner.summarize_stream(text, prompt, on_chunk):
+                yield delta
+            return
+
+        summary: str = await self._enqueue(text)
+        if on_chunk:
+            on_chunk(1, 1)
+        if summary:
+            yield summary
+
+    async def summarize_many(self, texts: List[str]) -> List[Optional[str]]:
+        return await self.inner.summarize_many(texts)
+
+    async def close(self) -> None:
+        self._flush()
+        await asyncio.gather(*self._requests, return_exceptions=True)
+        await self.inner.close()
+
+    def packing_stats(self) -> Dict[str, int]:
+        return dict(self._stats)
+
+    def packing_summary(self) -> List[str]:
+        stats: Dict[str, int] = self._stats
+        # Cada documento refeito individualmente é uma requisição a mais, além do lote que falhou.
+        requests: int = stats["packed_requests"] + stats["single_requests"] + stats["fallbacks"]
+        documents: int = stats["packed_documents"] + stats["single_requests"]
+        return [
+            f"{documents} documento(s) curto(s) em {requests} requisição(ões) | "
+            f"Lotes: {stats['packed_requests']} | Individuais: {stats['single_requests']} | "
+            f"Refeitos individualmente: {stats['fallbacks']}"
+        ]
+
+    async def _enqueue(self, text: str) -> str:
+        tokens: int = estimate_tokens(text)
+        if self._pending and (
+            self._pending_tokens + tokens > self.token_budget or len(self._pending) >= self.max_documents
+        ):
+            self._flush()
+
+        future: Future = asyncio.get_running_loop().create_future()
+        self._pending.append(_PendingDocument(text, tokens, future))
+        self._pending_tokens += tokens
+
+        if self._pending_tokens >= self.token_budget or len(self._pending) >= self.max_documents:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.linger_s, self._flush)
+
+        # Cancelar a espera cancela só o futuro deste documento; o lote segue para os demais.
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch: List[_PendingDocument] = self._pending
+        self._pending = []
+        self._pending_tokens = 0
+
+        task: asyncio.Task = asyncio.get_running_loop().create_task(self._send(batch))
+        self._requests.add(task)
+        task.add_done_callback(self._requests.discard)
+
+    async def _send(self, batch: List[_PendingDocument]) -> None:
+        # Documentos cujo chamador desistiu (timeout/cancelamento) não são enviados.
+        batch = [document for document in batch if not document.future.done()]
+        if not batch:
+            return
+
+        if len(batch) == 1:
+            self._stats["single_requests"] += 1
+            await self._send_single(batch[0])
+            return
+
+        self._stats["packed_requests"] += 1
+        self._stats["packed_documents"] += len(batch)
+
+        try:
+            summaries: List[Optional[str]] = await self.inner.summarize_many(
+                [document.text for document in batch]
+            )
+        except PackedResponseError as e:
+            logger.warning(f"{e}. Refazendo individualmente.")
+            summaries = [None] * len(batch)
+        except Exception as e:
+            for document in batch:
+                if not document.future.done():
+                    document.future.set_exception(e)
+            return
+
+        missing: List[_PendingDocument] = []
+        for document, summary in zip(batch, summaries):
+            if summary is None:
+                missing.append(document)
+            elif not document.future.done():
+                document.future.set_result(summary)
+
+        if missing:
+            self._stats["fallbacks"] += len(missing)
+            logger.info(f"{len(missing)} de {len(batch)} documento(s) sem resumo no lote: refazendo individualmente")
+            await asyncio.gather(*(self._send_single(document) for document in missing))
+
+    async def _send_single(self, document: _PendingDocument) -> None:
+        try:
+            summary: str = await self.inner.summarize(document.text)
+        except Exception as e:
+            if not document.future.done():
+                document.future.set_exception(e)
+        else:
+            if not document.future.done():
+                document.future.set_result(summary)
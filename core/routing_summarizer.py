@@ -0,0 +1,210 @@
+import asyncio
+import logging
+from collections import deque
+from logging import Logger
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from openai.types.chat import ChatCompletion
+
+from core.openai_summarizer import PACK_PROMPT, OpenAISummarizer
+from custom_types.routing_decision import RoutingDecision
+from enums import SummarizationStage
+
+logger: Logger = logging.getLogger(__name__)
+
+
+class RoutingSummarizer(OpenAISummarizer):
+
+    def __init__(
+        self,
+        small_model: str = "gpt-5-mini",
+        large_model: str = "gpt-5.2",
+        small_model_max_words: int = 400,
+        api_key: Optional[str] = None,
+        max_decisions: int = 1000,
+    ):
+        super().__init__(model=large_model, api_key=api_key)
+        self.small_model: str = small_model
+        self.large_model: str = large_model
+        self.small_model_max_words: int = small_model_max_words
+        self.decisions: Deque[RoutingDecision] = deque(maxlen=max_decisions)
+        self._model_stats: Dict[str, Dict[str, float]] = {}
+
+    def _route(self, stage: SummarizationStage, input_words: int) -> Tuple[str, str]:
+        if stage == SummarizationStage.REDUCE:
+            return self.large_model, "redução final"
+        if stage == SummarizationStage.MAP:
+            return self.small_model, "resumo intermediário"
+        if stage == SummarizationStage.PACKED:
+            return self.small_model, "lote de documentos curtos"
+        if input_words <= self.small_model_max_words:
+            return self.small_model, "documento curto"
+        return self.large_model, "documento longo"
+
+    @staticmethod
+    def _quality_issue(response: ChatCompletion) -> Optional[str]:
+        choice: Any = response.choices[0]
+        if not (choice.message.content or "").strip():
+            return "resposta vazia"
+        if choice.finish_reason == "length":
+            return "resposta truncada"
+        return None
+
+    async def _summarize_chunk(
+        self,
+        text: str,
+        prompt: Optional[str] = None,
+        stage: SummarizationStage = SummarizationStage.SINGLE,
+    ) -> str:
+        input_words: int = len(text.split())
+        model, reason = self._route(stage, input_words)
+
+        response, issue = await self._timed_complete(text, prompt, model, stage, input_words, reason)
+
+        if issue and model != self.large_model:
+            logger.info(f"Escalando de {model} para {self.large_model}: {issue}")
+            response, issue = await self._timed_complete(
+                text, prompt, self.large_model, stage, input_words, issue, escalated_from=model
+            )
+
+        if issue:
+            logger.warning(f"Resposta de {self.large_model} com problema de qualidade: {issue}")
+
+        return self._extract_summary(response)
+
+    async def _complete_packed(self, payload: str, count: int) -> str:
+        input_words: int = len(payload.split())
+        model, reason = self._route(SummarizationStage.PACKED, input_words)
+        params: Dict[str, Any] = self._packed_params(count)
+
+        response, issue = await self._timed_complete(
+            payload, PACK_PROMPT, model, SummarizationStage.PACKED, input_words, reason, **params
+        )
+
+        if issue and model != self.large_model:
+            logger.info(f"Escalando lote de {count} documento(s) de {model} para {self.large_model}: {issue}")
+            response, issue = await self._timed_complete(
+                payload, PACK_PROMPT, self.large_model, SummarizationStage.PACKED,
+                input_words, issue, escalated_from=model, **params,
+            )
+
+        return self._extract_summary(response)
+
+    async def _stream_chunk(
+        self,
+        text: str,
+        prompt: Optional[str] = None,
+        stage: SummarizationStage = SummarizationStage.SINGLE,
+    ) -> AsyncIterator[str]:
+        input_words: int = len(text.split())
+        model, reason = self._route(stage, input_words)
+
+        # Resposta do modelo menor pode precisar escalar (vazia ou truncada), e texto já
+        # entregue ao consumidor não pode ser refeito: só o modelo maior é transmitido em streaming.
+        if model != self.large_model:
+            summary: str = await self._summarize_chunk(text, prompt, stage)
+            if summary:
+                yield summary
+            return
+
+        loop = asyncio.get_running_loop()
+        start_time: float = loop.time()
+        emitted: bool = False
+        finish_reason: Optional[str] = None
+
+        async for chunk in self._stream_complete(text, prompt, model):
+            delta: Optional[str] = self._extract_delta(chunk)
+            if chunk.choices and chunk.choices[0].finish_reason:
+                finish_reason = chunk.choices[0].finish_reason
+            if delta:
+                emitted = emitted or bool(delta.strip())
+                yield delta
+
+        issue: Optional[str] = None
+        if not emitted:
+            issue = "resposta vazia"
+        elif finish_reason == "length":
+            issue = "resposta truncada"
+
+        self._record(
+            RoutingDecision(
+                stage=stage,
+                model=model,
+                input_words=input_words,
+                latency_ms=(loop.time() - start_time) * 1000,
+                reason=reason,
+            ),
+            failed=issue is not None,
+        )
+        if issue:
+            logger.warning(f"Resposta de {model} com problema de qualidade: {issue}")
+
+    async def _timed_complete(
+        self,
+        text: str,
+        prompt: Optional[str],
+        model: str,
+        stage: SummarizationStage,
+        input_words: int,
+        reason: str,
+        escalated_from: Optional[str] = None,
+        **overrides: Any,
+    ) -> Tuple[ChatCompletion, Optional[str]]:
+        loop = asyncio.get_running_loop()
+        start_time: float = loop.time()
+
+        response: ChatCompletion = await self._complete(text, prompt, model, **overrides)
+        latency_ms: float = (loop.time() - start_time) * 1000
+        issue: Optional[str] = self._quality_issue(response)
+
+        self._record(
+            RoutingDecision(
+                stage=stage,
+                model=model,
+                input_words=input_words,
+                latency_ms=latency_ms,
+                reason=reason,
+                escalated_from=escalated_from,
+            ),
+            failed=issue is not None,
+        )
+        return response, issue
+
+    def _record(self, decision: RoutingDecision, failed: bool) -> None:
+        self.decisions.append(decision)
+
+        stats: Dict[str, float] = self._model_stats.setdefault(
+            decision.model,
+            {"calls": 0, "total_latency_ms": 0.0, "max_latency_ms": 0.0, "escalations": 0, "quality_failures": 0},
+        )
+        stats["calls"] += 1
+        stats["total_latency_ms"] += decision.latency_ms
+        stats["max_latency_ms"] = max(stats["max_latency_ms"], decision.latency_ms)
+        if decision.escalated:
+            stats["escalations"] += 1
+        if failed:
+            stats["quality_failures"] += 1
+
+        logger.debug(
+            f"Roteamento: {decision.stage.value} -> {decision.model} "
+            f"({decision.reason}, {decision.input_words} palavras, {decision.latency_ms:.0f}ms)"
+        )
+
+    def routing_stats(self) -> Dict[str, Dict[str, float]]:
+        report: Dict[str, Dict[str, float]] = {}
+        for model, stats in self._model_stats.items():
+            report[model] = {
+                **stats,
+                "avg_latency_ms": stats["total_latency_ms"] / stats["calls"] if stats["calls"] else 0.0,
+            }
+        return report
+
+    def routing_summary(self) -> List[str]:
+        return [
+            f"{model}: {int(stats['calls'])} chamada(s) | "
+            f"Média: {stats['avg_latency_ms']:.0f}ms | "
+            f"Máx: {stats['max_latency_ms']:.0f}ms | "
+            f"Escaladas: {int(stats['escalations'])} | "
+            f"Falhas de qualidade: {int(stats['quality_failures'])}"
+            for model, stats in self.routing_stats().items()
+        ]
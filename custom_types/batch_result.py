@@ -17,6 +17,14 @@ class BatchResult:
     def error_count(self) -> int:
         return sum(1 for r in self.results if r.status == ProcessingStatus.ERROR)
 
+    @property
+    def timed_out_count(self) -> int:
+        return sum(1 for r in self.results if r.status == ProcessingStatus.TIMED_OUT)
+
+    @property
+    def cancelled_count(self) -> int:
+        return sum(1 for r in self.results if r.status == ProcessingStatus.CANCELLED)
+
     @property
     def total_count(self) -> int:
         return len(self.results)
@@ -30,6 +38,9 @@ class BatchResult:
     def get_errors(self) -> list[DocumentResult]:
         return [r for r in self.results if r.status == ProcessingStatus.ERROR]
 
+    def get_by_status(self, status: ProcessingStatus) -> list[DocumentResult]:
+        return [r for r in self.results if r.status == status]
+
     def get_successful(self) -> list[DocumentResult]:
         return [r for r in self.results if r.is_success]
 
@@ -38,6 +49,8 @@ class BatchResult:
             f"Processados: {self.total_count} | "
             f"Sucesso: {self.success_count} | "
             f"Erros: {self.error_count} | "
+            f"Timeouts: {self.timed_out_count} | "
+            f"Cancelados: {self.cancelled_count} | "
             f"Taxa: {self.success_rate:.1f}% | "
             f"Tempo: {self.total_processing_time_ms:.0f}ms"
         )
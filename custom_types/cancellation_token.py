@@ -0,0 +1,20 @@
+import threading
+
+from exceptions import OperationCancelledError
+
+
+class CancellationToken:
+
+    def __init__(self) -> None:
+        self._event: threading.Event = threading.Event()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise OperationCancelledError("Operação cancelada")
@@ -0,0 +1,22 @@
+from dataclasses import asdict, dataclass
+from typing import Any, Dict
+
+
+@dataclass
+class ChunkRecord:
+    chunk_id: int
+    document_id: str
+    chunk_index: int
+    text: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ChunkRecord":
+        return cls(
+            chunk_id=int(data["chunk_id"]),
+            document_id=data["document_id"],
+            chunk_index=int(data["chunk_index"]),
+            text=data["text"],
+        )
@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 from enums import ProcessingStatus
 
 @dataclass
@@ -22,6 +22,18 @@ class DocumentResult:
     def is_success(self) -> bool:
         return self.status == ProcessingStatus.SUCCESS
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "file_path": self.file_path,
+            "file_name": self.file_name,
+            "status": self.status.value,
+            "summary": self.summary,
+            "error_message": self.error_message,
+            "page_count": self.page_count,
+            "word_count": self.word_count,
+            "processing_time_ms": self.processing_time_ms,
+        }
+
     def __repr__(self) -> str:
         status_icon = "✓" if self.is_success else "✗"
         return f"{status_icon} {self.file_name} ({self.status.value})"
@@ -0,0 +1,5 @@
+from typing import Callable, List, TypeAlias
+
+import numpy as np
+
+EmbedFunction: TypeAlias = Callable[[List[str]], np.ndarray]
@@ -0,0 +1,5 @@
+from typing import Callable, TypeAlias
+
+from .processing_event import ProcessingEvent
+
+EventCallback: TypeAlias = Callable[[ProcessingEvent], None]
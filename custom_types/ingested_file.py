@@ -0,0 +1,110 @@
+import io
+import threading
+from dataclasses import dataclass, field
+from mmap import mmap
+from typing import BinaryIO, Callable, Optional
+
+
+class _BufferStream(io.RawIOBase):
+
+    def __init__(self, view: memoryview, on_close: Optional[Callable[[], None]] = None) -> None:
+        super().__init__()
+        self._view: memoryview = view
+        self._position: int = 0
+        self._on_close: Optional[Callable[[], None]] = on_close
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position: int = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"whence inválido: {whence}")
+
+        if position < 0:
+            raise ValueError(f"Posição negativa: {position}")
+        self._position = position
+        return position
+
+    def readinto(self, buffer) -> int:
+        start: int = min(self._position, len(self._view))
+        end: int = min(start + len(buffer), len(self._view))
+        size: int = end - start
+        buffer[:size] = self._view[start:end]
+        self._position = end
+        return size
+
+    def read(self, size: int = -1) -> bytes:
+        start: int = min(self._position, len(self._view))
+        end: int = len(self._view) if size is None or size < 0 else min(start + size, len(self._view))
+        self._position = end
+        return self._view[start:end].tobytes()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self._view.release()
+        super().close()
+        if self._on_close:
+            self._on_close()
+
+
+@dataclass
+class IngestedFile:
+    file_path: str
+    content_hash: str
+    size: int
+    buffer: Optional[mmap] = None
+    _open_streams: int = field(default=0, init=False, repr=False, compare=False)
+    _closing: bool = field(default=False, init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    @property
+    def view(self) -> memoryview:
+        if self.buffer is None:
+            return memoryview(b"")
+        return memoryview(self.buffer)
+
+    def open_stream(self) -> BinaryIO:
+        with self._lock:
+            if self._closing:
+                raise ValueError(f"Arquivo já foi fechado: {self.file_path}")
+            self._open_streams += 1
+        return _BufferStream(self.view, on_close=self._release_stream)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closing = True
+            # Uma thread do executor abandonada por timeout/cancelamento ainda pode estar lendo:
+            # o mapeamento é liberado quando o último stream for fechado.
+            if self._open_streams:
+                return
+        self._close_buffer()
+
+    def _release_stream(self) -> None:
+        with self._lock:
+            self._open_streams -= 1
+            if self._open_streams or not self._closing:
+                return
+        self._close_buffer()
+
+    def _close_buffer(self) -> None:
+        if self.buffer is not None and not self.buffer.closed:
+            self.buffer.close()
+
+    def __enter__(self) -> "IngestedFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from enums import ProcessingEventType
+from .document_result import DocumentResult
+
+
+@dataclass
+class ProcessingEvent:
+    type: ProcessingEventType
+    file_path: str
+    stage: Optional[str] = None
+    text: Optional[str] = None
+    chunk_index: int = 0
+    total_chunks: int = 0
+    result: Optional[DocumentResult] = None
+
+    @property
+    def file_name(self) -> str:
+        from pathlib import Path
+        return Path(self.file_path).name
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"type": self.type.value, "file_path": self.file_path}
+        if self.stage is not None:
+            data["stage"] = self.stage
+        if self.text is not None:
+            data["text"] = self.text
+        if self.total_chunks:
+            data["chunk_index"] = self.chunk_index
+            data["total_chunks"] = self.total_chunks
+        if self.result is not None:
+            data["result"] = self.result.to_dict()
+        return data
@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from enums import SummarizationStage
+
+
+@dataclass
+class RoutingDecision:
+    stage: SummarizationStage
+    model: str
+    input_words: int
+    latency_ms: float
+    reason: str
+    escalated_from: Optional[str] = None
+
+    @property
+    def escalated(self) -> bool:
+        return self.escalated_from is not None
@@ -0,0 +1,28 @@
+from dataclasses import asdict, dataclass
+from typing import Any, Dict
+
+from custom_types.chunk_record import ChunkRecord
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    chunk_id: int
+    document_id: str
+    chunk_index: int
+    text: str
+    distance: float
+    rank: int
+
+    @classmethod
+    def from_record(cls, record: ChunkRecord, distance: float, rank: int) -> "SearchHit":
+        return cls(
+            chunk_id=record.chunk_id,
+            document_id=record.document_id,
+            chunk_index=record.chunk_index,
+            text=record.text,
+            distance=distance,
+            rank=rank,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
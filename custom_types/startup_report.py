@@ -0,0 +1,23 @@
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+
+@dataclass
+class StartupReport:
+    module: str
+    total_ms: float
+    budget_ms: float
+    heavy_modules: List[str] = field(default_factory=list)
+    slowest_imports: List[Tuple[str, float]] = field(default_factory=list)
+
+    @property
+    def within_budget(self) -> bool:
+        return self.total_ms <= self.budget_ms and not self.heavy_modules
+
+    def summary(self) -> str:
+        heavy: str = ", ".join(self.heavy_modules) or "nenhum"
+        return (
+            f"Import de '{self.module}': {self.total_ms:.0f}ms "
+            f"(orçamento: {self.budget_ms:.0f}ms) | "
+            f"Módulos pesados carregados: {heavy}"
+        )
@@ -1,6 +1,10 @@
+from .processing_event_type_enum import ProcessingEventType
 from .processing_status_enum import ProcessingStatus
+from .summarization_stage_enum import SummarizationStage
 from typing import List
 
 __all__: List[str] = [
-    "ProcessingStatus"
-]
\ No newline at end of file
+    "ProcessingEventType",
+    "ProcessingStatus",
+    "SummarizationStage"
+]
@@ -0,0 +1,8 @@
+from typing import Literal
+from enum import Enum
+
+class ProcessingEventType(Enum):
+    STAGE_STARTED: Literal['stage_started'] = 'stage_started'
+    CHUNK_DONE: Literal['chunk_done'] = 'chunk_done'
+    PARTIAL_SUMMARY: Literal['partial_summary'] = 'partial_summary'
+    DOCUMENT_DONE: Literal['document_done'] = 'document_done'
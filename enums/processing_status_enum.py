@@ -6,3 +6,5 @@ class ProcessingStatus(Enum):
     ERROR: Literal['error'] = 'error'
     SKIPPED: Literal['skipped'] = 'skipped'
     EMPTY_CONTENT: Literal['empty_content'] = 'empty_content'
+    TIMED_OUT: Literal['timed_out'] = 'timed_out'
+    CANCELLED: Literal['cancelled'] = 'cancelled'
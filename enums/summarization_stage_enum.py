@@ -0,0 +1,8 @@
+from typing import Literal
+from enum import Enum
+
+class SummarizationStage(Enum):
+    SINGLE: Literal['single'] = 'single'
+    MAP: Literal['map'] = 'map'
+    REDUCE: Literal['reduce'] = 'reduce'
+    PACKED: Literal['packed'] = 'packed'
@@ -0,0 +1,11 @@
+from typing import List
+
+from .operation_cancelled_exception import OperationCancelledError
+from .packed_response_exception import PackedResponseError
+from .stage_timeout_exception import StageTimeoutError
+
+__all__: List[str] = [
+    "OperationCancelledError",
+    "PackedResponseError",
+    "StageTimeoutError"
+]
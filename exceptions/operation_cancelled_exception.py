@@ -0,0 +1,2 @@
+class OperationCancelledError(Exception):
+    pass
@@ -0,0 +1,4 @@
+class PackedResponseError(ValueError):
+    def __init__(self, message: str, document_count: int) -> None:
+        super().__init__(f"Resposta agrupada inválida para {document_count} documento(s): {message}")
+        self.document_count: int = document_count
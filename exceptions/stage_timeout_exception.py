@@ -0,0 +1,5 @@
+class StageTimeoutError(TimeoutError):
+    def __init__(self, stage: str, timeout_s: float) -> None:
+        super().__init__(f"Etapa '{stage}' excedeu o prazo de {timeout_s:g}s")
+        self.stage: str = stage
+        self.timeout_s: float = timeout_s
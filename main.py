@@ -1,19 +1,134 @@
+import argparse
 import asyncio
 import logging
+import signal
 import sys
 from logging import Logger
 from pathlib import Path
-from typing import List, Dict, Union
+from typing import Callable, List, Dict, Optional, Set, Tuple, Union
 
 from dotenv import load_dotenv
 
 import config
-from adapters import DocxAdapter, PdfAdapter, BaseAdapter
-from core.openai_summarizer import OpenAISummarizer
+from adapters.adapter_registry import AdapterRegistry
+from core.base_summarizer import BaseSummarizer
 from custom_types.batch_result import BatchResult
 from custom_types.document_result import DocumentResult
+from custom_types.processing_event import ProcessingEvent
+from custom_types.startup_report import StartupReport
+from enums import ProcessingEventType, ProcessingStatus
 from services.document_service import DocumentService
+from services.summarization_server import SummarizationServer
 from utils.file_utils import find_files
+from utils.profiler import Profiler
+from utils.result_writer import JsonlResultWriter
+from utils.startup_util import measure_startup
+
+
+def non_negative_seconds(value: str) -> float:
+    try:
+        seconds: float = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Valor inválido '{value}': informe um número de segundos.")
+    if seconds < 0:
+        raise argparse.ArgumentTypeError(f"Valor inválido '{value}': o prazo não pode ser negativo.")
+    return seconds
+
+
+def parse_stage_timeout(value: str) -> Tuple[str, float]:
+    stage, separator, seconds = value.partition("=")
+    stage = stage.strip()
+    if not separator or not stage:
+        raise argparse.ArgumentTypeError(
+            f"Formato inválido '{value}'. Use ETAPA=SEGUNDOS, por exemplo parse=60."
+        )
+    if stage not in DocumentService.STAGES:
+        raise argparse.ArgumentTypeError(
+            f"Etapa desconhecida '{stage}'. Use uma de: {', '.join(DocumentService.STAGES)}."
+        )
+    return stage, non_negative_seconds(seconds)
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Bot de sumarização de processos."
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Executa como serviço persistente com API HTTP local.",
+    )
+    parser.add_argument("--host", default=config.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=config.SERVER_PORT)
+    parser.add_argument(
+        "--unix-socket",
+        default=None,
+        help="Caminho de um socket Unix (substitui --host/--port).",
+    )
+    parser.add_argument(
+        "--routing",
+        action="store_true",
+        help="Roteia trechos curtos e intermediários para um modelo menor.",
+    )
+    parser.add_argument(
+        "--pack",
+        action="store_true",
+        help="Agrupa documentos curtos em uma única requisição ao modelo.",
+    )
+    parser.add_argument(
+        "--document-timeout",
+        type=non_negative_seconds,
+        default=config.DOCUMENT_TIMEOUT_S,
+        help="Prazo máximo por documento em segundos (0 desativa).",
+    )
+    parser.add_argument(
+        "--stage-timeout",
+        type=parse_stage_timeout,
+        action="append",
+        default=[],
+        metavar="ETAPA=SEGUNDOS",
+        help=f"Prazo por etapa ({', '.join(DocumentService.STAGES)}). Pode ser repetido.",
+    )
+    parser.add_argument(
+        "--grace-period",
+        type=non_negative_seconds,
+        default=config.GRACE_PERIOD_S,
+        help="Tempo para concluir arquivos em andamento após SIGINT/SIGTERM.",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help="Número máximo de arquivos processados simultaneamente.",
+    )
+    parser.add_argument(
+        "--results-file",
+        default=None,
+        help="Grava cada resultado em JSONL assim que o arquivo termina.",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        default=None,
+        help=(
+            "Coleta perfil de CPU/memória e latência do event loop, salvando em DIR. "
+            "Processa um arquivo por vez, salvo se --max-concurrency for informado."
+        ),
+    )
+    parser.add_argument("--profile-interval-ms", type=float, default=5.0)
+    parser.add_argument("--profile-top", type=int, default=20)
+    parser.add_argument(
+        "--loop-lag-ms",
+        type=float,
+        default=100.0,
+        help="Limite para reportar callbacks que bloqueiam o event loop.",
+    )
+    parser.add_argument(
+        "--check-startup",
+        action="store_true",
+        help="Mede o tempo de import do entrypoint e falha se exceder o orçamento.",
+    )
+    return parser.parse_args(argv)
 
 
 def setup_logging() -> None:
@@ -30,6 +145,23 @@ def print_progress(result: DocumentResult, current: int, total: int) -> None:
     logging.info(f"  [{current}/{total}] {status} {result.file_name}")
 
 
+def create_event_printer() -> Callable[[ProcessingEvent], None]:
+    streaming: Set[str] = set()
+
+    def print_event(event: ProcessingEvent) -> None:
+        if event.type == ProcessingEventType.CHUNK_DONE and event.total_chunks > 1:
+            logging.info(
+                f"  ↳ {event.file_name}: trecho {event.chunk_index}/{event.total_chunks} resumido"
+            )
+        elif event.type == ProcessingEventType.PARTIAL_SUMMARY and event.file_path not in streaming:
+            streaming.add(event.file_path)
+            logging.info(f"  ✎ {event.file_name}: recebendo resumo...")
+        elif event.type == ProcessingEventType.DOCUMENT_DONE:
+            streaming.discard(event.file_path)
+
+    return print_event
+
+
 def print_batch_results(batch: BatchResult, title: str) -> None:
     logging.info(f"\n{'='*60}")
     logging.info(f" {title}")
@@ -61,11 +193,133 @@ def print_batch_results(batch: BatchResult, title: str) -> None:
         for result in errors:
             logging.info(f"  ✗ {result.file_name}: {result.error_message}")
 
+    interrupted: List[DocumentResult] = batch.get_by_status(
+        ProcessingStatus.TIMED_OUT
+    ) + batch.get_by_status(ProcessingStatus.CANCELLED)
+
+    if interrupted:
+        logging.info("\n⏱  Interrompidos:")
+        logging.info("-" * 40)
+        for result in interrupted:
+            logging.info(f"  ✗ {result.file_name} ({result.status.value}): {result.error_message}")
+
+
+def install_signal_handlers(shutdown: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    main_task: Optional[asyncio.Task] = asyncio.current_task()
+
+    def handle_signal(sig: signal.Signals) -> None:
+        if shutdown.is_set():
+            logging.warning(f"{sig.name} recebido novamente: interrompendo imediatamente.")
+            if main_task:
+                main_task.cancel()
+            return
+        logging.warning(
+            f"{sig.name} recebido: nenhum arquivo novo será iniciado; "
+            "aguardando os que estão em andamento."
+        )
+        shutdown.set()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, handle_signal, sig)
+        except (NotImplementedError, RuntimeError):
+            # Plataformas sem suporte (ex.: Windows) seguem com KeyboardInterrupt.
+            pass
+
+
+def check_startup() -> bool:
+    report: StartupReport = measure_startup("main", config.STARTUP_BUDGET_MS)
+
+    logging.info(f"⏱  {report.summary()}")
+    for name, elapsed_ms in report.slowest_imports:
+        logging.info(f"  {elapsed_ms:8.1f}ms  {name}")
+
+    if not report.within_budget:
+        logging.error("Inicialização fora do orçamento definido em STARTUP_BUDGET_MS.")
+    return report.within_budget
+
+
+def create_summarizer(args: argparse.Namespace) -> BaseSummarizer:
+    summarizer: BaseSummarizer
+    if args.routing:
+        from core.routing_summarizer import RoutingSummarizer
+
+        summarizer = RoutingSummarizer(
+            small_model=config.SMALL_MODEL_NAME,
+            large_model=config.LARGE_MODEL_NAME,
+            small_model_max_words=config.SMALL_MODEL_MAX_WORDS,
+        )
+    else:
+        from core.openai_summarizer import OpenAISummarizer
 
-async def main() -> None:
+        summarizer = OpenAISummarizer(model=config.LARGE_MODEL_NAME)
+
+    if args.pack:
+        from core.packing_summarizer import PackingSummarizer
+
+        summarizer = PackingSummarizer(
+            summarizer,
+            token_budget=config.PACK_TOKEN_BUDGET,
+            max_document_tokens=config.PACK_MAX_DOCUMENT_TOKENS,
+            max_documents=config.PACK_MAX_DOCUMENTS,
+            linger_ms=config.PACK_LINGER_MS,
+        )
+    return summarizer
+
+
+def print_routing_stats(summarizer: BaseSummarizer) -> None:
+    packing_summary: Optional[Callable[[], List[str]]] = getattr(summarizer, "packing_summary", None)
+    if packing_summary:
+        logging.info("\n📦 Agrupamento de documentos curtos:")
+        logging.info("-" * 40)
+        for line in packing_summary():
+            logging.info(f"  {line}")
+        summarizer = getattr(summarizer, "inner", summarizer)
+
+    routing_summary: Optional[Callable[[], List[str]]] = getattr(summarizer, "routing_summary", None)
+    if not routing_summary:
+        return
+
+    logging.info("\n🧭 Roteamento de modelos:")
+    logging.info("-" * 40)
+    for line in routing_summary():
+        logging.info(f"  {line}")
+
+
+async def serve(
+    args: argparse.Namespace,
+    service: DocumentService,
+    shutdown: asyncio.Event,
+) -> None:
+    logger: Logger = logging.getLogger(__name__)
+
+    server: SummarizationServer = SummarizationServer(service=service, root_dir=config.DATA_DIR)
+
+    await server.start(host=args.host, port=args.port, unix_socket=args.unix_socket)
+    logger.info(" 🚀 Serviço de sumarização ativo (Ctrl-C para encerrar)")
+
+    serve_task: asyncio.Task = asyncio.create_task(server.serve_forever())
+    shutdown_waiter: asyncio.Task = asyncio.create_task(shutdown.wait())
+
+    try:
+        await asyncio.wait({serve_task, shutdown_waiter}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        shutdown_waiter.cancel()
+        await server.close(grace_period_s=args.grace_period)
+        serve_task.cancel()
+        await asyncio.gather(serve_task, return_exceptions=True)
+
+
+async def main(args: argparse.Namespace) -> None:
     setup_logging()
     logger: Logger = logging.getLogger(__name__)
 
+    if args.check_startup:
+        if not check_startup():
+            sys.exit(1)
+        return
+
     load_dotenv()
 
     logger.info("\n" + "=" * 60)
@@ -81,7 +335,7 @@ async def main() -> None:
         return
 
     try:
-        summarizer: OpenAISummarizer = OpenAISummarizer()
+        summarizer: BaseSummarizer = create_summarizer(args)
     except ValueError as e:
         logger.error(f"Erro ao inicializar o sumarizador: {e}")
         logger.info(
@@ -89,56 +343,106 @@ async def main() -> None:
         )
         return
 
-    adapters: Dict[str, BaseAdapter] = {
-        ".pdf": PdfAdapter(),
-        ".docx": DocxAdapter(),
-    }
+    profiler: Optional[Profiler] = None
+    if args.profile:
+        profiler = Profiler(
+            output_dir=args.profile,
+            interval_ms=args.profile_interval_ms,
+            loop_lag_threshold_ms=args.loop_lag_ms,
+            top_n=args.profile_top,
+        )
+        if args.max_concurrency is None:
+            # O pico de memória por documento só é confiável sem documentos simultâneos.
+            args.max_concurrency = 1
+            logger.info("Profiling: processando um arquivo por vez (use --max-concurrency para alterar)")
+        profiler.start()
+
+    shutdown: asyncio.Event = asyncio.Event()
+    install_signal_handlers(shutdown)
+
+    try:
+        await run(args, summarizer, profiler, shutdown)
+    finally:
+        if profiler:
+            await profiler.stop()
+        await summarizer.close()
+
+
+async def run(
+    args: argparse.Namespace,
+    summarizer: BaseSummarizer,
+    profiler: Optional[Profiler],
+    shutdown: asyncio.Event,
+) -> None:
+    logger: Logger = logging.getLogger(__name__)
+
+    adapter_registry: AdapterRegistry = AdapterRegistry()
+    document_service: DocumentService = DocumentService(
+        summarizer=summarizer,
+        adapter_registry=adapter_registry,
+        profiler=profiler,
+        document_timeout_s=args.document_timeout or None,
+        stage_timeouts=dict(args.stage_timeout),
+    )
 
-    all_files: List[str] = []
-    for ext in adapters.keys():
-        all_files.extend(find_files(config.DATA_DIR, ext))
+    if args.serve:
+        await serve(args, document_service, shutdown)
+        return
+
+    files_by_ext: Dict[str, List[str]] = {
+        ext: find_files(config.DATA_DIR, ext) for ext in adapter_registry.extensions()
+    }
+    all_files: List[str] = [f for files in files_by_ext.values() for f in files]
 
     total_files: int = len(all_files)
 
+    breakdown: str = ", ".join(
+        f"{len(files)} {ext.lstrip('.').upper()}(s)" for ext, files in files_by_ext.items()
+    )
     logger.info(
-        f"\n🔍 Encontrados: {len(all_files)} arquivo(s) para processar ({len([f for f in all_files if f.endswith('.pdf')])} PDF(s), {len([f for f in all_files if f.endswith('.docx')])} DOCX(s))"
+        f"\n🔍 Encontrados: {total_files} arquivo(s) para processar ({breakdown})"
     )
 
     if total_files == 0:
         logger.info(f"\n⚠️  Nenhum arquivo encontrado em '{config.DATA_DIR}'")
         return
 
-    async def process_file_with_correct_adapter(file_path: str, p_bar: dict) -> DocumentResult:
-        ext: str = Path(file_path).suffix
-        adapter: BaseAdapter = adapters[ext]
-        document_service: DocumentService = DocumentService(
-            adapter=adapter, summarizer=summarizer
-        )
-        result: DocumentResult = await document_service.process_file(file_path)
-        p_bar["current"] += 1
-        print_progress(result, p_bar["current"], p_bar["total"])
-        return result
+    writer: Optional[JsonlResultWriter] = (
+        JsonlResultWriter(args.results_file).open() if args.results_file else None
+    )
 
-    p_bar_info: Dict[str, int] = {"current": 0, "total": total_files}
-    
-    tasks = [
-        process_file_with_correct_adapter(file, p_bar_info) for file in all_files
-    ]
-    
-    results: List[DocumentResult] = await asyncio.gather(*tasks)
+    def on_progress(result: DocumentResult, current: int, total: int) -> None:
+        print_progress(result, current, total)
+        if writer:
+            writer.write(result)
 
-    batch_result: BatchResult = BatchResult(results=results)
+    try:
+        batch_result: BatchResult = await document_service.process_batch(
+            all_files,
+            on_progress=on_progress,
+            on_event=create_event_printer(),
+            max_concurrency=args.max_concurrency,
+            shutdown=shutdown,
+            grace_period_s=args.grace_period,
+        )
+    finally:
+        if writer:
+            writer.close()
 
     print_batch_results(batch_result, "RESULTADOS - TODOS OS ARQUIVOS")
+    print_routing_stats(summarizer)
 
     logger.info("\n" + "=" * 60)
-    logger.info(" ✅ PROCESSAMENTO FINALIZADO")
+    if shutdown.is_set():
+        logger.info(" ⚠️  PROCESSAMENTO ENCERRADO ANTECIPADAMENTE")
+    else:
+        logger.info(" ✅ PROCESSAMENTO FINALIZADO")
     logger.info("=" * 60 + "\n")
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
-    except KeyboardInterrupt:
+        asyncio.run(main(parse_args(sys.argv[1:])))
+    except (KeyboardInterrupt, asyncio.CancelledError):
         print("\n\n⚠️  Processamento cancelado pelo usuário.")
         sys.exit(0)
@@ -1,8 +1,10 @@
 from .discovery_service import DiscoveryService
 from .document_service import DocumentService
+from .summarization_server import SummarizationServer
 from typing import List
 
 __all__: List[str] = [
     "DiscoveryService",
-    "DocumentService"
+    "DocumentService",
+    "SummarizationServer"
 ] 
\ No newline at end of file
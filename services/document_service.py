@@ -1,17 +1,27 @@
 import asyncio
-import hashlib
 import logging
+from contextlib import AbstractContextManager, asynccontextmanager, nullcontext
+from dataclasses import replace
 from pathlib import Path
-from typing import Optional, List, Callable, Awaitable
+from typing import AsyncIterator, Awaitable, Dict, Optional, List, Callable, Set, Tuple
 
 from logging import Logger
 
+from adapters.adapter_registry import AdapterRegistry
 from adapters.base_adapter import BaseAdapter
 from core.base_summarizer import BaseSummarizer
 from custom_types.batch_result import BatchResult
 from custom_types.document_result import DocumentResult
+from custom_types.event_callback import EventCallback
+from custom_types.ingested_file import IngestedFile
+from custom_types.processing_event import ProcessingEvent
 from decorators import injectable
-from enums import ProcessingStatus
+from enums import ProcessingEventType, ProcessingStatus
+from exceptions import StageTimeoutError
+from utils.cancellation_util import run_cancellable
+from utils.ingestion_util import ingest_file
+from utils.profiler import Profiler
+from utils.single_flight import SingleFlight
 
 logger: Logger = logging.getLogger(__name__)
 
@@ -19,65 +29,271 @@ logger: Logger = logging.getLogger(__name__)
 @injectable
 class DocumentService:
 
+    STAGES: Tuple[str, ...] = ("ingest", "parse", "summarize")
+
     def __init__(
         self,
         summarizer: BaseSummarizer,
         adapter: Optional[BaseAdapter] = None,
         enable_cache: bool = True,
+        adapter_registry: Optional[AdapterRegistry] = None,
+        profiler: Optional[Profiler] = None,
+        document_timeout_s: Optional[float] = None,
+        stage_timeouts: Optional[Dict[str, float]] = None,
     ) -> None:
         self.adapter: Optional[BaseAdapter] = adapter
+        self.adapter_registry: Optional[AdapterRegistry] = adapter_registry
         self.summarizer: BaseSummarizer = summarizer
+        self.profiler: Optional[Profiler] = profiler
+        self.document_timeout_s: Optional[float] = document_timeout_s
+        self.stage_timeouts: Dict[str, float] = dict(stage_timeouts or {})
         self.enable_cache: bool = enable_cache
         self._cache: dict[str, DocumentResult] = {}
+        self._single_flight: SingleFlight[DocumentResult] = SingleFlight()
+        self._subscribers: Dict[str, List[Tuple[str, EventCallback]]] = {}
+        self._event_history: Dict[str, List[ProcessingEvent]] = {}
+
+    @property
+    def cache_size(self) -> int:
+        return len(self._cache)
+
+    @property
+    def in_flight_count(self) -> int:
+        return self._single_flight.in_flight_count
 
-    def _get_file_hash(self, file_path: str) -> str:
-        path: Path = Path(file_path)
-        stat = path.stat()
-        key: str = f"{file_path}:{stat.st_size}:{stat.st_mtime}"
-        return hashlib.md5(key.encode()).hexdigest()
+    def supports(self, file_path: str) -> bool:
+        if self.adapter:
+            return True
+        return bool(self.adapter_registry and self.adapter_registry.supports(file_path))
 
-    def _get_cached_result(self, file_path: str) -> Optional[DocumentResult]:
+    def _resolve_adapter(self, file_path: str) -> BaseAdapter:
+        if self.adapter:
+            return self.adapter
+        if self.adapter_registry:
+            return self.adapter_registry.for_file(file_path)
+        raise ValueError("Adapter not set for DocumentService")
+
+    def _get_cached_result(self, content_hash: str) -> Optional[DocumentResult]:
         if not self.enable_cache:
             return None
-        file_hash: str = self._get_file_hash(file_path)
-        return self._cache.get(file_hash)
+        return self._cache.get(content_hash)
 
-    def _cache_result(self, file_path: str, result: DocumentResult) -> None:
+    def _cache_result(self, content_hash: str, result: DocumentResult) -> None:
         if self.enable_cache and result.is_success:
-            file_hash: str = self._get_file_hash(file_path)
-            self._cache[file_hash] = result
+            self._cache[content_hash] = result
+
+    def _profile_stage(self, name: str) -> AbstractContextManager:
+        return self.profiler.stage(name) if self.profiler else nullcontext()
+
+    def _profile_document(self, file_path: str) -> AbstractContextManager:
+        return self.profiler.document(file_path) if self.profiler else nullcontext()
+
+    @asynccontextmanager
+    async def _stage(self, name: str) -> AsyncIterator[None]:
+        timeout_s: Optional[float] = self.stage_timeouts.get(name)
+        deadline = asyncio.timeout(timeout_s)
+
+        with self._profile_stage(name):
+            try:
+                async with deadline:
+                    yield
+            except TimeoutError as e:
+                if not deadline.expired():
+                    raise
+                raise StageTimeoutError(name, timeout_s) from e
+
+    @staticmethod
+    def _emit(on_event: Optional[EventCallback], event: ProcessingEvent) -> None:
+        if not on_event:
+            return
+        try:
+            on_event(event)
+        except Exception as e:
+            logger.warning(f"Erro no consumidor de eventos ({event.type.value}): {e}")
+
+    def _subscribe(self, key: str, file_path: str, on_event: Optional[EventCallback]) -> None:
+        if not on_event:
+            return
+        self._subscribers.setdefault(key, []).append((file_path, on_event))
+        # Quem entra depois do líder recebe o que já foi emitido para o mesmo conteúdo.
+        for event in self._event_history.get(key, ()):
+            self._emit(on_event, replace(event, file_path=file_path))
+
+    def _unsubscribe(self, key: str, file_path: str, on_event: Optional[EventCallback]) -> None:
+        subscribers: List[Tuple[str, EventCallback]] = self._subscribers.get(key, [])
+        if (file_path, on_event) in subscribers:
+            subscribers.remove((file_path, on_event))
+        if not subscribers:
+            self._subscribers.pop(key, None)
+
+    def _broadcaster(self, key: str, history: List[ProcessingEvent]) -> EventCallback:
+        def broadcast(event: ProcessingEvent) -> None:
+            # Uma execução cancelada que ainda não terminou não fala pelos assinantes da seguinte.
+            if self._event_history.get(key) is not history:
+                return
+            history.append(event)
+            for file_path, on_event in list(self._subscribers.get(key, ())):
+                self._emit(
+                    on_event,
+                    event if event.file_path == file_path else replace(event, file_path=file_path),
+                )
+
+        return broadcast
+
+    async def process_file(
+        self,
+        file_path: str,
+        on_event: Optional[EventCallback] = None,
+    ) -> DocumentResult:
+        with self._profile_document(file_path):
+            result: DocumentResult = await self._process_with_deadline(file_path, on_event)
+        self._emit(
+            on_event,
+            ProcessingEvent(ProcessingEventType.DOCUMENT_DONE, file_path, result=result),
+        )
+        return result
+
+    async def stream_file(self, file_path: str) -> AsyncIterator[ProcessingEvent]:
+        queue: asyncio.Queue[ProcessingEvent] = asyncio.Queue()
+        task: asyncio.Task = asyncio.create_task(self.process_file(file_path, queue.put_nowait))
+
+        try:
+            while True:
+                event: ProcessingEvent = await queue.get()
+                yield event
+                if event.type == ProcessingEventType.DOCUMENT_DONE:
+                    return
+        finally:
+            if not task.done():
+                task.cancel()
 
-    async def process_file(self, file_path: str) -> DocumentResult:
+    async def _process_with_deadline(
+        self,
+        file_path: str,
+        on_event: Optional[EventCallback],
+    ) -> DocumentResult:
+        loop = asyncio.get_running_loop()
+        start_time: float = loop.time()
+        deadline = asyncio.timeout(self.document_timeout_s)
+
+        try:
+            async with deadline:
+                return await self._process_file(file_path, on_event)
+        except StageTimeoutError as e:
+            message: str = str(e)
+        except TimeoutError:
+            if not deadline.expired():
+                raise
+            message = f"Documento excedeu o prazo de {self.document_timeout_s:g}s"
+
+        logger.warning(f"Tempo esgotado: {file_path}: {message}")
+        return DocumentResult(
+            file_path=file_path,
+            status=ProcessingStatus.TIMED_OUT,
+            error_message=message,
+            processing_time_ms=(loop.time() - start_time) * 1000,
+        )
+
+    async def _process_file(
+        self,
+        file_path: str,
+        on_event: Optional[EventCallback],
+    ) -> DocumentResult:
         loop = asyncio.get_running_loop()
         start_time: float = loop.time()
 
-        cached: Optional[DocumentResult] = self._get_cached_result(file_path)
-        if cached:
-            logger.debug(f"Cache hit: {file_path}")
-            return cached
+        self._emit(
+            on_event,
+            ProcessingEvent(ProcessingEventType.STAGE_STARTED, file_path, stage="ingest"),
+        )
+
+        try:
+            async with self._stage("ingest"):
+                document: IngestedFile = await run_cancellable(ingest_file, file_path)
+        except TimeoutError:
+            raise
+        except FileNotFoundError:
+            return DocumentResult(
+                file_path=file_path,
+                status=ProcessingStatus.ERROR,
+                error_message=f"Arquivo não encontrado: {file_path}",
+            )
+        except IsADirectoryError:
+            return DocumentResult(
+                file_path=file_path,
+                status=ProcessingStatus.ERROR,
+                error_message=f"Caminho não é um arquivo: {file_path}",
+            )
+        except OSError as e:
+            logger.error(f"Erro ao ler {file_path}: {e}")
+            return DocumentResult(
+                file_path=file_path,
+                status=ProcessingStatus.ERROR,
+                error_message=str(e),
+                processing_time_ms=(loop.time() - start_time) * 1000,
+            )
+
+        # O documento passa a pertencer à tarefa compartilhada quando este chamador a inicia;
+        # caso contrário (cache ou processamento já em andamento) é fechado aqui.
+        handed_over: List[bool] = [False]
+
+        def lead() -> Awaitable[DocumentResult]:
+            handed_over[0] = True
+            return self._lead(key, document, start_time)
 
+        key: str = document.content_hash
         try:
-            if not self.adapter:
-                raise ValueError("Adapter not set for DocumentService")
+            cached: Optional[DocumentResult] = self._get_cached_result(key)
+            if cached:
+                logger.debug(f"Cache hit: {file_path}")
+                return replace(cached, file_path=file_path)
 
-            path: Path = Path(file_path)
-            if not await loop.run_in_executor(None, path.exists):
-                return DocumentResult(
-                    file_path=file_path,
-                    status=ProcessingStatus.ERROR,
-                    error_message=f"Arquivo não encontrado: {file_path}",
-                )
+            if self._single_flight.is_in_flight(key):
+                logger.debug(f"Aguardando processamento em andamento: {file_path}")
 
-            if not await loop.run_in_executor(None, path.is_file):
-                return DocumentResult(
-                    file_path=file_path,
-                    status=ProcessingStatus.ERROR,
-                    error_message=f"Caminho não é um arquivo: {file_path}",
-                )
+            self._subscribe(key, file_path, on_event)
+            try:
+                result: DocumentResult = await self._single_flight.do(key, lead)
+            finally:
+                self._unsubscribe(key, file_path, on_event)
+        finally:
+            if not handed_over[0]:
+                document.close()
+
+        if result.file_path != file_path:
+            return replace(result, file_path=file_path)
+        return result
+
+    async def _lead(self, key: str, document: IngestedFile, start_time: float) -> DocumentResult:
+        history: List[ProcessingEvent] = []
+        self._event_history[key] = history
+        with document:
+            try:
+                return await self._process_uncached(document, start_time, self._broadcaster(key, history))
+            finally:
+                if self._event_history.get(key) is history:
+                    del self._event_history[key]
+
+    async def _process_uncached(
+        self,
+        document: IngestedFile,
+        start_time: float,
+        on_event: Optional[EventCallback],
+    ) -> DocumentResult:
+        loop = asyncio.get_running_loop()
+        file_path: str = document.file_path
 
+        try:
+            adapter: BaseAdapter = self._resolve_adapter(file_path)
+            path: Path = Path(file_path)
             logger.info(f"Processando: {path.name}")
 
-            text: str = await self.adapter.read_text(file_path)
+            self._emit(
+                on_event,
+                ProcessingEvent(ProcessingEventType.STAGE_STARTED, file_path, stage="parse"),
+            )
+            async with self._stage("parse"):
+                text: str = await adapter.read_ingested(document)
 
             if not text or not text.strip():
                 return DocumentResult(
@@ -88,7 +304,8 @@ class DocumentService:
                 )
 
             word_count: int = len(text.split())
-            summary: str = await self.summarizer.summarize(text)
+            async with self._stage("summarize"):
+                summary: str = await self._summarize(file_path, text, on_event)
             elapsed_ms: float = (loop.time() - start_time) * 1000
 
             result = DocumentResult(
@@ -99,10 +316,12 @@ class DocumentService:
                 processing_time_ms=elapsed_ms,
             )
 
-            self._cache_result(file_path, result)
+            self._cache_result(document.content_hash, result)
             logger.info(f"Concluído: {path.name} ({elapsed_ms:.0f}ms)")
             return result
 
+        except StageTimeoutError:
+            raise
         except Exception as e:
             elapsed_ms: float = (loop.time() - start_time) * 1000
             logger.error(f"Erro ao processar {file_path}: {e}", exc_info=True)
@@ -113,10 +332,46 @@ class DocumentService:
                 processing_time_ms=elapsed_ms,
             )
 
+    async def _summarize(
+        self,
+        file_path: str,
+        text: str,
+        on_event: Optional[EventCallback],
+    ) -> str:
+        self._emit(
+            on_event,
+            ProcessingEvent(ProcessingEventType.STAGE_STARTED, file_path, stage="summarize"),
+        )
+
+        def on_chunk(index: int, total: int) -> None:
+            self._emit(
+                on_event,
+                ProcessingEvent(
+                    ProcessingEventType.CHUNK_DONE,
+                    file_path,
+                    stage="summarize",
+                    chunk_index=index,
+                    total_chunks=total,
+                ),
+            )
+
+        parts: List[str] = []
+        async for delta in self.summarizer.summarize_stream(text, on_chunk=on_chunk):
+            parts.append(delta)
+            self._emit(
+                on_event,
+                ProcessingEvent(ProcessingEventType.PARTIAL_SUMMARY, file_path, text=delta),
+            )
+        return "".join(parts).strip()
+
     async def process_batch(
         self,
         file_paths: list[str],
         on_progress: Optional[Callable[[DocumentResult, int, int], None]] = None,
+        on_event: Optional[EventCallback] = None,
+        max_concurrency: Optional[int] = None,
+        shutdown: Optional[asyncio.Event] = None,
+        grace_period_s: float = 30.0,
     ) -> BatchResult:
         if not file_paths:
             return BatchResult()
@@ -126,28 +381,117 @@ class DocumentService:
         total = len(file_paths)
         logger.info(f"Iniciando processamento de {total} arquivo(s)")
 
-        tasks: List[Awaitable[DocumentResult]] = []
-        for i, file_path in enumerate(file_paths):
-            task = self._create_progress_wrapped_task(file_path, i, total, on_progress)
-            tasks.append(task)
-        
-        results: List[DocumentResult] = await asyncio.gather(*tasks)
+        semaphore: Optional[asyncio.Semaphore] = (
+            asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        )
+        completed: List[int] = [0]
+        started: Set[str] = set()
+        tasks: List[asyncio.Task] = [
+            asyncio.create_task(
+                self._create_progress_wrapped_task(
+                    file_path, completed, total, on_progress, on_event, semaphore, shutdown, started
+                )
+            )
+            for file_path in file_paths
+        ]
+
+        try:
+            await self._wait_or_drain(file_paths, tasks, started, shutdown, grace_period_s)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        results: List[DocumentResult] = []
+        for file_path, task in zip(file_paths, tasks):
+            if task.cancelled():
+                result = DocumentResult(
+                    file_path=file_path,
+                    status=ProcessingStatus.CANCELLED,
+                    error_message=(
+                        "Interrompido no encerramento após o período de tolerância"
+                        if file_path in started
+                        else "Não iniciado: encerramento solicitado"
+                    ),
+                )
+                completed[0] += 1
+                if on_progress:
+                    on_progress(result, completed[0], total)
+            else:
+                result = task.result()
+            results.append(result)
 
         elapsed_ms: float = (loop.time() - start_time) * 1000
         batch_result = BatchResult(results=results, total_processing_time_ms=elapsed_ms)
         logger.info(f"Batch concluído: {batch_result.summary()}")
         return batch_result
 
+    async def _wait_or_drain(
+        self,
+        file_paths: List[str],
+        tasks: List[asyncio.Task],
+        started: Set[str],
+        shutdown: Optional[asyncio.Event],
+        grace_period_s: float,
+    ) -> None:
+        gathered: asyncio.Future = asyncio.gather(*tasks, return_exceptions=True)
+        if not shutdown:
+            await gathered
+            return
+
+        shutdown_waiter: asyncio.Task = asyncio.create_task(shutdown.wait())
+        try:
+            await asyncio.wait({gathered, shutdown_waiter}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            shutdown_waiter.cancel()
+
+        if gathered.done():
+            return
+
+        in_flight: List[asyncio.Task] = []
+        for file_path, task in zip(file_paths, tasks):
+            if task.done():
+                continue
+            if file_path in started:
+                in_flight.append(task)
+            else:
+                task.cancel()
+
+        logger.warning(
+            f"Encerramento solicitado: aguardando até {grace_period_s:g}s "
+            f"por {len(in_flight)} arquivo(s) em andamento"
+        )
+        if in_flight:
+            _, pending = await asyncio.wait(in_flight, timeout=grace_period_s)
+            for task in pending:
+                task.cancel()
+        await gathered
+
     async def _create_progress_wrapped_task(
         self,
         file_path: str,
-        index: int,
+        completed: List[int],
         total: int,
         on_progress: Optional[Callable[[DocumentResult, int, int], None]],
+        on_event: Optional[EventCallback],
+        semaphore: Optional[asyncio.Semaphore] = None,
+        shutdown: Optional[asyncio.Event] = None,
+        started: Optional[Set[str]] = None,
     ) -> DocumentResult:
-        result = await self.process_file(file_path)
+        async with semaphore or nullcontext():
+            if shutdown and shutdown.is_set():
+                result = DocumentResult(
+                    file_path=file_path,
+                    status=ProcessingStatus.CANCELLED,
+                    error_message="Não iniciado: encerramento solicitado",
+                )
+            else:
+                if started is not None:
+                    started.add(file_path)
+                result = await self.process_file(file_path, on_event)
+        completed[0] += 1
         if on_progress:
-            on_progress(result, index + 1, total)
+            on_progress(result, completed[0], total)
         return result
 
     def clear_cache(self) -> int:
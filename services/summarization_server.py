@@ -0,0 +1,266 @@
+import asyncio
+import json
+import logging
+import os
+import stat
+import uuid
+from asyncio import AbstractServer, StreamReader, StreamWriter, Task
+from logging import Logger
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from custom_types.document_result import DocumentResult
+from services.document_service import DocumentService
+
+logger: Logger = logging.getLogger(__name__)
+
+_REASONS: Dict[int, str] = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+_MAX_BODY_BYTES: int = 64 * 1024
+_MAX_RETAINED_JOBS: int = 1000
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status: int = status
+        self.message: str = message
+
+
+class SummarizationServer:
+
+    def __init__(
+        self,
+        service: DocumentService,
+        root_dir: str,
+    ) -> None:
+        self.service: DocumentService = service
+        self.root_dir: Path = Path(root_dir).resolve()
+        self._jobs: Dict[str, Task] = {}
+        self._server: Optional[AbstractServer] = None
+
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        unix_socket: Optional[str] = None,
+    ) -> None:
+        if unix_socket:
+            self._remove_stale_socket(unix_socket)
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=unix_socket)
+            logger.info(f"Servidor ouvindo em unix:{unix_socket}")
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host, port)
+            logger.info(f"Servidor ouvindo em http://{host}:{port}")
+
+    @staticmethod
+    def _remove_stale_socket(unix_socket: str) -> None:
+        try:
+            mode: int = os.stat(unix_socket).st_mode
+        except FileNotFoundError:
+            return
+        # Só remove sockets deixados por uma execução anterior, nunca um arquivo comum.
+        if not stat.S_ISSOCK(mode):
+            raise FileExistsError(f"Caminho do socket já existe e não é um socket: {unix_socket}")
+        os.unlink(unix_socket)
+
+    async def serve_forever(self) -> None:
+        if not self._server:
+            raise RuntimeError("Servidor não iniciado. Chame start() primeiro.")
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self, grace_period_s: float = 0.0) -> None:
+        if self._server:
+            self._server.close()
+
+        pending: List[Task] = [job for job in self._jobs.values() if not job.done()]
+        if pending and grace_period_s > 0:
+            logger.info(
+                f"Aguardando até {grace_period_s:g}s por {len(pending)} documento(s) em andamento"
+            )
+            _, still_pending = await asyncio.wait(pending, timeout=grace_period_s)
+            pending = list(still_pending)
+
+        for job in pending:
+            job.cancel()
+        await asyncio.gather(*self._jobs.values(), return_exceptions=True)
+
+        if self._server:
+            await self._server.wait_closed()
+
+    async def _handle_connection(self, reader: StreamReader, writer: StreamWriter) -> None:
+        try:
+            method, target, body = await self._read_request(reader)
+            if self._route_path(target) == "/summaries/stream":
+                self._require_method(method, "POST")
+                await self._stream_summary(writer, self._resolve_request(body))
+                return
+            status, payload = await self._dispatch(method, target, body)
+        except HttpError as e:
+            status, payload = e.status, {"error": e.message}
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        except Exception as e:
+            logger.error(f"Erro inesperado no servidor: {e}", exc_info=True)
+            status, payload = 500, {"error": str(e)}
+
+        try:
+            self._write_response(writer, status, payload)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: StreamReader) -> Tuple[str, str, bytes]:
+        request_line: bytes = await reader.readline()
+        parts = request_line.decode("latin-1").strip().split()
+        if len(parts) != 3:
+            raise HttpError(400, "Linha de requisição inválida")
+        method, target, _ = parts
+
+        headers: Dict[str, str] = {}
+        while True:
+            line: bytes = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length: int = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            raise HttpError(400, "Content-Length inválido")
+        if length > _MAX_BODY_BYTES:
+            raise HttpError(413, "Corpo da requisição muito grande")
+        body: bytes = await reader.readexactly(length) if length else b""
+        return method.upper(), target, body
+
+    async def _stream_summary(self, writer: StreamWriter, file_path: str) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: application/x-ndjson; charset=utf-8\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+
+        try:
+            async for event in self.service.stream_file(file_path):
+                line: bytes = json.dumps(event.to_dict(), ensure_ascii=False).encode("utf-8") + b"\n"
+                writer.write(f"{len(line):X}\r\n".encode("latin-1") + line + b"\r\n")
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        except ConnectionError:
+            logger.debug(f"Cliente desconectou durante o streaming de {file_path}")
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _route_path(target: str) -> str:
+        return target.split("?", 1)[0].rstrip("/") or "/"
+
+    def _write_response(self, writer: StreamWriter, status: int, payload: Dict[str, Any]) -> None:
+        body: bytes = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head: str = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        path: str = self._route_path(target)
+
+        if path == "/health":
+            self._require_method(method, "GET")
+            return 200, self._health()
+
+        if path == "/summaries":
+            self._require_method(method, "POST")
+            file_path: str = self._resolve_request(body)
+            result: DocumentResult = await self.service.process_file(file_path)
+            return 200, result.to_dict()
+
+        if path == "/documents":
+            self._require_method(method, "POST")
+            file_path = self._resolve_request(body)
+            job_id: str = uuid.uuid4().hex
+            self._prune_jobs()
+            self._jobs[job_id] = asyncio.create_task(self.service.process_file(file_path))
+            return 202, {"id": job_id, "status": "pending"}
+
+        if path.startswith("/documents/"):
+            self._require_method(method, "GET")
+            return self._job_status(path[len("/documents/"):])
+
+        raise HttpError(404, f"Rota não encontrada: {path}")
+
+    def _require_method(self, method: str, expected: str) -> None:
+        if method != expected:
+            raise HttpError(405, f"Método {method} não permitido")
+
+    def _resolve_request(self, body: bytes) -> str:
+        try:
+            data: Any = json.loads(body or b"{}")
+        except json.JSONDecodeError as e:
+            raise HttpError(400, f"JSON inválido: {e}")
+
+        raw_path: Any = data.get("file_path") if isinstance(data, dict) else None
+        if not isinstance(raw_path, str) or not raw_path:
+            raise HttpError(400, "Campo 'file_path' é obrigatório")
+
+        path: Path = Path(raw_path)
+        if not path.is_absolute():
+            path = self.root_dir / path
+        path = path.resolve()
+
+        if not path.is_relative_to(self.root_dir):
+            raise HttpError(403, f"Arquivo fora do diretório permitido: {raw_path}")
+
+        if not self.service.supports(str(path)):
+            raise HttpError(400, f"Extensão não suportada: {path.suffix or raw_path}")
+
+        return str(path)
+
+    def _prune_jobs(self) -> None:
+        overflow: int = len(self._jobs) - _MAX_RETAINED_JOBS + 1
+        if overflow <= 0:
+            return
+        finished = [job_id for job_id, job in self._jobs.items() if job.done()]
+        for job_id in finished[:overflow]:
+            del self._jobs[job_id]
+
+    def _job_status(self, job_id: str) -> Tuple[int, Dict[str, Any]]:
+        job: Optional[Task] = self._jobs.get(job_id)
+        if not job:
+            raise HttpError(404, f"Documento não encontrado: {job_id}")
+
+        if not job.done():
+            return 202, {"id": job_id, "status": "pending"}
+
+        if job.cancelled():
+            return 500, {"id": job_id, "status": "cancelled"}
+
+        result: DocumentResult = job.result()
+        return 200, {"id": job_id, **result.to_dict()}
+
+    def _health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "in_flight": self.service.in_flight_count,
+            "cached": self.service.cache_size,
+            "jobs": len(self._jobs),
+        }
@@ -0,0 +1,28 @@
+import contextlib
+import io
+import unittest
+
+from main import parse_args
+
+
+class ParseArgsTest(unittest.TestCase):
+
+    def _rejects(self, *argv: str) -> None:
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+            parse_args(list(argv))
+
+    def test_stage_timeouts_accept_known_stages(self) -> None:
+        args = parse_args(["--stage-timeout", "parse=60", "--stage-timeout", " summarize =0"])
+
+        self.assertEqual(args.stage_timeout, [("parse", 60.0), ("summarize", 0.0)])
+
+    def test_rejects_unknown_stage_and_negative_seconds(self) -> None:
+        self._rejects("--stage-timeout", "extract=60")
+        self._rejects("--stage-timeout", "parse=-1")
+        self._rejects("--stage-timeout", "parse")
+        self._rejects("--document-timeout", "-5")
+        self._rejects("--grace-period", "-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,219 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from typing import AsyncIterator, Callable, List, Optional
+
+from adapters.base_adapter import BaseAdapter
+from core.base_summarizer import BaseSummarizer
+from custom_types.batch_result import BatchResult
+from custom_types.cancellation_token import CancellationToken
+from custom_types.document_result import DocumentResult
+from custom_types.ingested_file import IngestedFile
+from custom_types.processing_event import ProcessingEvent
+from enums import ProcessingEventType, ProcessingStatus
+from services.document_service import DocumentService
+from utils.cancellation_util import run_cancellable
+
+
+class TextAdapter(BaseAdapter):
+
+    def read_text(self, file_path: str) -> str:
+        with open(file_path, encoding="utf-8") as file:
+            return file.read()
+
+    async def read_ingested(self, document: IngestedFile) -> str:
+        return bytes(document.view).decode("utf-8")
+
+
+def _slow_read(document: IngestedFile, token: Optional[CancellationToken] = None) -> str:
+    # Simula um PDF patológico: segura o stream aberto sobre o mmap na thread do executor.
+    with document.open_stream() as stream:
+        for _ in range(10):
+            time.sleep(0.05)
+            if token:
+                token.raise_if_cancelled()
+        return stream.read().decode("utf-8")
+
+
+class SlowAdapter(TextAdapter):
+
+    async def read_ingested(self, document: IngestedFile) -> str:
+        return await run_cancellable(_slow_read, document)
+
+
+class SlowStreamingSummarizer(BaseSummarizer):
+
+    def __init__(self) -> None:
+        self.calls: int = 0
+
+    async def summarize(self, text: str, prompt: Optional[str] = None) -> str:
+        return "resumo"
+
+    async def summarize_stream(
+        self,
+        text: str,
+        prompt: Optional[str] = None,
+        on_chunk: Optional[Callable[[int, int], None]] = None,
+    ) -> AsyncIterator[str]:
+        self.calls += 1
+        for part in ("re", "su", "mo"):
+            await asyncio.sleep(0.05)
+            yield part
+        if on_chunk:
+            on_chunk(1, 1)
+
+
+class SlowClosingSummarizer(SlowStreamingSummarizer):
+
+    async def summarize_stream(
+        self,
+        text: str,
+        prompt: Optional[str] = None,
+        on_chunk: Optional[Callable[[int, int], None]] = None,
+    ) -> AsyncIterator[str]:
+        try:
+            async for part in super().summarize_stream(text, prompt, on_chunk):
+                yield part
+        finally:
+            # Como fechar a resposta HTTP do stream: a execução cancelada demora a terminar.
+            await asyncio.sleep(0.1)
+
+
+class DocumentServiceTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def _write(self, name: str, content: str) -> str:
+        path: str = os.path.join(self.temp_dir.name, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return path
+
+    async def test_coalesced_requests_receive_streaming_events(self) -> None:
+        path: str = self._write("a.txt", "conteúdo do processo " * 20)
+        service: DocumentService = DocumentService(SlowStreamingSummarizer(), adapter=TextAdapter())
+
+        async def collect() -> List[ProcessingEvent]:
+            return [event async for event in service.stream_file(path)]
+
+        leader, follower = await asyncio.gather(collect(), collect())
+
+        for events in (leader, follower):
+            types: List[ProcessingEventType] = [event.type for event in events]
+            self.assertIn(ProcessingEventType.PARTIAL_SUMMARY, types)
+            self.assertIn(ProcessingEventType.CHUNK_DONE, types)
+            self.assertEqual(types[-1], ProcessingEventType.DOCUMENT_DONE)
+            self.assertEqual(
+                "".join(e.text for e in events if e.type == ProcessingEventType.PARTIAL_SUMMARY),
+                "resumo",
+            )
+
+    async def test_concurrent_requests_for_same_content_summarize_once(self) -> None:
+        paths: List[str] = [self._write(f"{i}.txt", "mesmo conteúdo") for i in range(2)]
+        summarizer: SlowStreamingSummarizer = SlowStreamingSummarizer()
+        service: DocumentService = DocumentService(summarizer, adapter=TextAdapter(), enable_cache=False)
+
+        results: List[DocumentResult] = await asyncio.gather(*(service.process_file(p) for p in paths))
+
+        self.assertEqual([r.status for r in results], [ProcessingStatus.SUCCESS] * 2)
+        self.assertEqual([r.file_path for r in results], paths)
+        self.assertEqual(summarizer.calls, 1)
+
+    async def test_cancelling_first_caller_keeps_work_for_the_others(self) -> None:
+        paths: List[str] = [self._write(f"{i}.txt", "mesmo conteúdo") for i in range(2)]
+        summarizer: SlowStreamingSummarizer = SlowStreamingSummarizer()
+        service: DocumentService = DocumentService(summarizer, adapter=TextAdapter(), enable_cache=False)
+
+        leader: asyncio.Task = asyncio.create_task(service.process_file(paths[0]))
+        await asyncio.sleep(0.02)
+        follower: asyncio.Task = asyncio.create_task(service.process_file(paths[1]))
+        await asyncio.sleep(0.05)
+        leader.cancel()
+
+        result: DocumentResult = await follower
+
+        self.assertTrue(leader.cancelled())
+        self.assertEqual(result.summary, "resumo")
+        self.assertEqual(summarizer.calls, 1)
+        self.assertEqual(service.in_flight_count, 0)
+
+    async def test_follower_events_survive_leader_disconnect(self) -> None:
+        path: str = self._write("a.txt", "mesmo conteúdo")
+        summarizer: SlowStreamingSummarizer = SlowStreamingSummarizer()
+        service: DocumentService = DocumentService(summarizer, adapter=TextAdapter())
+
+        async def disconnect_after_first_partial() -> None:
+            async for event in service.stream_file(path):
+                if event.type == ProcessingEventType.PARTIAL_SUMMARY:
+                    return
+
+        async def collect() -> List[ProcessingEvent]:
+            return [event async for event in service.stream_file(path)]
+
+        _, events = await asyncio.gather(disconnect_after_first_partial(), collect())
+
+        stages: List[str] = [e.stage for e in events if e.type == ProcessingEventType.STAGE_STARTED]
+        self.assertEqual(stages, ["ingest", "parse", "summarize"])
+        self.assertEqual(
+            "".join(e.text for e in events if e.type == ProcessingEventType.PARTIAL_SUMMARY), "resumo"
+        )
+        self.assertEqual(summarizer.calls, 1)
+
+    async def test_abandoned_run_does_not_clear_history_of_the_next(self) -> None:
+        path: str = self._write("a.txt", "mesmo conteúdo")
+        service: DocumentService = DocumentService(SlowClosingSummarizer(), adapter=TextAdapter())
+
+        abandoned: asyncio.Task = asyncio.create_task(service.process_file(path))
+        await asyncio.sleep(0.07)
+        abandoned.cancel()
+        current: asyncio.Task = asyncio.create_task(service.process_file(path))
+        await asyncio.sleep(0.12)
+
+        late: List[ProcessingEvent] = []
+        await service.process_file(path, late.append)
+        await current
+
+        stages: List[str] = [e.stage for e in late if e.type == ProcessingEventType.STAGE_STARTED]
+        self.assertEqual(stages, ["ingest", "parse", "summarize"])
+        self.assertEqual(
+            "".join(e.text for e in late if e.type == ProcessingEventType.PARTIAL_SUMMARY), "resumo"
+        )
+
+    async def test_stage_timeout_during_parse_returns_timed_out(self) -> None:
+        path: str = self._write("a.txt", "conteúdo")
+        service: DocumentService = DocumentService(
+            SlowStreamingSummarizer(), adapter=SlowAdapter(), stage_timeouts={"parse": 0.1}
+        )
+
+        result: DocumentResult = await service.process_file(path)
+
+        self.assertEqual(result.status, ProcessingStatus.TIMED_OUT)
+        self.assertIn("parse", result.error_message)
+
+    async def test_document_timeout_during_parse_returns_timed_out(self) -> None:
+        path: str = self._write("a.txt", "conteúdo")
+        service: DocumentService = DocumentService(
+            SlowStreamingSummarizer(), adapter=SlowAdapter(), document_timeout_s=0.1
+        )
+
+        result: DocumentResult = await service.process_file(path)
+
+        self.assertEqual(result.status, ProcessingStatus.TIMED_OUT)
+
+    async def test_grace_period_cancel_during_parse_returns_cancelled(self) -> None:
+        paths: List[str] = [self._write(f"{i}.txt", f"conteúdo {i}") for i in range(3)]
+        service: DocumentService = DocumentService(SlowStreamingSummarizer(), adapter=SlowAdapter())
+        shutdown: asyncio.Event = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.1, shutdown.set)
+
+        batch: BatchResult = await service.process_batch(paths, shutdown=shutdown, grace_period_s=0.05)
+
+        self.assertEqual(batch.cancelled_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import tempfile
+import threading
+import unittest
+from typing import List
+from unittest import mock
+
+import faiss
+import numpy as np
+
+from adapters.faiss_adapter import FaissAdapter
+from custom_types.search_hit import SearchHit
+
+DIM: int = 8
+
+
+def _vectors(count: int, seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).random((count, DIM), dtype=np.float32)
+
+
+class FaissAdapterTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.adapter: FaissAdapter = FaissAdapter(embedding_dim=DIM, compaction_ratio=1.0)
+        for document in range(50):
+            self.adapter.upsert_document(
+                f"doc{document}", [f"d{document}-c{i}" for i in range(4)], _vectors(4, document)
+            )
+
+    def test_writes_and_searches_proceed_during_compaction(self) -> None:
+        for document in range(10):
+            self.adapter.delete_document(f"doc{document}")
+
+        started: threading.Event = threading.Event()
+        release: threading.Event = threading.Event()
+        clone_index = faiss.clone_index
+
+        def slow_clone(index):
+            started.set()
+            release.wait(5)
+            return clone_index(index)
+
+        with mock.patch.object(faiss, "clone_index", slow_clone):
+            compactor: threading.Thread = self.adapter.compact_in_background()
+            self.assertTrue(started.wait(5))
+
+            # Compactação bloqueada no meio: nada disto pode esperar por ela.
+            self.adapter.upsert_document("novo", ["n-0", "n-1"], _vectors(2, 100))
+            self.adapter.upsert_document("doc0", ["d0-c0"], _vectors(1, 0)[:1])
+            self.adapter.delete_document("doc20")
+            hits: List[List[SearchHit]] = self.adapter.search(_vectors(2, 100), k=1)
+            self.assertEqual([h[0].document_id for h in hits], ["novo", "novo"])
+            self.assertTrue(compactor.is_alive())
+
+            release.set()
+            compactor.join(5)
+
+        self.assertEqual(self.adapter.index.ntotal, self.adapter.live_count + self.adapter.tombstone_count)
+        self.assertEqual(self.adapter.tombstone_count, 4)
+        self.assertEqual([r.text for r in self.adapter.document_chunks("doc0")], ["d0-c0"])
+        self.assertEqual(self.adapter.search(_vectors(1, 0)[:1], k=1)[0][0].document_id, "doc0")
+
+        self.adapter.compact()
+        self.assertEqual(self.adapter.index.ntotal, self.adapter.live_count)
+
+    def test_search_excludes_tombstones_without_over_fetching(self) -> None:
+        for document in range(0, 50, 2):
+            self.adapter.delete_document(f"doc{document}")
+
+        with mock.patch.object(self.adapter.index, "search", wraps=self.adapter.index.search) as search:
+            hits: List[List[SearchHit]] = self.adapter.search(_vectors(4, 2), k=3)
+
+        self.assertEqual(search.call_args.args[1], 3)
+        self.assertTrue(all(len(row) == 3 for row in hits))
+        self.assertTrue(all(int(hit.document_id[3:]) % 2 for row in hits for hit in row))
+
+    def test_id_collision_is_rejected_without_changes(self) -> None:
+        real_chunk_id = FaissAdapter.chunk_id
+        colliding: int = real_chunk_id("doc1", 0, "d1-c0")
+
+        def chunk_id(document_id: str, chunk_index: int, text: str) -> int:
+            if document_id == "repetido":
+                return 7
+            return colliding if document_id == "novo" else real_chunk_id(document_id, chunk_index, text)
+
+        live: int = self.adapter.live_count
+        with mock.patch.object(FaissAdapter, "chunk_id", staticmethod(chunk_id)):
+            with self.assertRaises(ValueError):
+                self.adapter.upsert_document("novo", ["n-0"], _vectors(1, 100))
+            with self.assertRaises(ValueError):
+                self.adapter.upsert_document("repetido", ["r-0", "r-1"], _vectors(2, 101))
+
+        self.assertEqual(self.adapter.live_count, live)
+        self.assertEqual(self.adapter.document_chunks("novo"), [])
+        self.assertEqual(self.adapter.document_chunks("repetido"), [])
+        self.assertEqual([r.text for r in self.adapter.document_chunks("doc1")], [f"d1-c{i}" for i in range(4)])
+
+    def test_load_index_rejects_id_mapped_index(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path: str = os.path.join(temp_dir, "index.faiss")
+            self.adapter.save_index(path)
+            with self.assertRaises(ValueError):
+                self.adapter.load_index(path)
+
+            snapshot: str = os.path.join(temp_dir, "index.snapshot")
+            self.adapter.save_snapshot(snapshot)
+            restored: FaissAdapter = FaissAdapter(embedding_dim=DIM)
+            restored.load_snapshot(snapshot)
+
+        self.assertEqual(restored.live_count, self.adapter.live_count)
+        self.assertEqual(restored.search(_vectors(4, 7), k=1)[2][0].document_id, "doc7")
+
+    def test_loading_older_snapshot_discards_cached_results(self) -> None:
+        query: np.ndarray = _vectors(1, 3)[:1]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            snapshot: str = os.path.join(temp_dir, "index.snapshot")
+            self.adapter.save_snapshot(snapshot)
+
+            self.adapter.delete_document("doc3")
+            self.assertNotEqual(self.adapter.search(query, k=1)[0][0].document_id, "doc3")
+
+            self.adapter.load_snapshot(snapshot)
+
+        self.assertEqual(self.adapter.search(query, k=1)[0][0].document_id, "doc3")
+        self.assertEqual(self.adapter.live_count, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
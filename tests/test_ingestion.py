@@ -0,0 +1,165 @@
+import hashlib
+import io
+import os
+import tempfile
+import unittest
+from typing import List
+
+from adapters.docx_adapter import DocxAdapter
+from adapters.pdf_adapter import PdfAdapter
+from custom_types.cancellation_token import CancellationToken
+from custom_types.ingested_file import IngestedFile, _BufferStream
+from exceptions import OperationCancelledError
+from utils.ingestion_util import ingest_file
+
+ROOT_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOCX_PATH: str = os.path.join(ROOT_DIR, "data", "0012197-59.2022.5.15.0135 Leitura Processo.docx")
+
+
+def _minimal_pdf(text: str) -> bytes:
+    content: bytes = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content),
+    ]
+
+    pdf: bytes = b"%PDF-1.4\n"
+    offsets: List[int] = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+
+    xref: int = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return pdf
+
+
+class IngestFileTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def _write(self, name: str, content: bytes) -> str:
+        path: str = os.path.join(self.temp_dir.name, name)
+        with open(path, "wb") as file:
+            file.write(content)
+        return path
+
+    def test_hashes_content_through_mmap(self) -> None:
+        content: bytes = "conteúdo do processo ".encode("utf-8") * 1000
+        path: str = self._write("a.txt", content)
+
+        with ingest_file(path) as document:
+            self.assertEqual(document.size, len(content))
+            self.assertEqual(document.content_hash, hashlib.sha256(content).hexdigest())
+            self.assertEqual(bytes(document.view), content)
+
+        self.assertTrue(document.buffer.closed)
+
+    def test_empty_file_is_not_mapped(self) -> None:
+        path: str = self._write("vazio.txt", b"")
+
+        with ingest_file(path) as document:
+            self.assertEqual(document.size, 0)
+            self.assertIsNone(document.buffer)
+            self.assertEqual(document.content_hash, hashlib.sha256(b"").hexdigest())
+            self.assertEqual(bytes(document.view), b"")
+
+    def test_directory_and_missing_file_raise(self) -> None:
+        with self.assertRaises(IsADirectoryError):
+            ingest_file(self.temp_dir.name)
+        with self.assertRaises(FileNotFoundError):
+            ingest_file(os.path.join(self.temp_dir.name, "inexistente.pdf"))
+
+    def test_cancelled_token_aborts_hashing(self) -> None:
+        path: str = self._write("a.txt", "conteúdo".encode("utf-8"))
+        token: CancellationToken = CancellationToken()
+        token.cancel()
+
+        with self.assertRaises(OperationCancelledError):
+            ingest_file(path, token=token)
+
+
+class BufferStreamTest(unittest.TestCase):
+
+    def test_seek_read_and_readinto(self) -> None:
+        stream: _BufferStream = _BufferStream(memoryview(b"0123456789"))
+
+        self.assertEqual(stream.read(3), b"012")
+        self.assertEqual(stream.seek(2, io.SEEK_CUR), 5)
+        self.assertEqual(stream.read(), b"56789")
+        self.assertEqual(stream.read(), b"")
+
+        self.assertEqual(stream.seek(-4, io.SEEK_END), 6)
+        buffer: bytearray = bytearray(8)
+        self.assertEqual(stream.readinto(buffer), 4)
+        self.assertEqual(bytes(buffer[:4]), b"6789")
+        self.assertEqual(stream.tell(), 10)
+
+        self.assertEqual(stream.seek(20), 20)
+        self.assertEqual(stream.read(5), b"")
+
+    def test_invalid_seek_raises(self) -> None:
+        stream: _BufferStream = _BufferStream(memoryview(b"0123"))
+
+        with self.assertRaises(ValueError):
+            stream.seek(-1)
+        with self.assertRaises(ValueError):
+            stream.seek(0, 3)
+        self.assertEqual(stream.tell(), 0)
+
+    def test_close_releases_view_and_notifies(self) -> None:
+        closed: List[bool] = []
+        view: memoryview = memoryview(b"0123")
+        stream: _BufferStream = _BufferStream(view, on_close=lambda: closed.append(True))
+
+        stream.close()
+        stream.close()
+
+        self.assertEqual(closed, [True])
+        with self.assertRaises(ValueError):
+            view.tobytes()
+
+
+class IngestedAdaptersTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_docx_read_ingested_matches_file_read(self) -> None:
+        adapter: DocxAdapter = DocxAdapter()
+
+        with ingest_file(DOCX_PATH) as document:
+            text: str = await adapter.read_ingested(document)
+
+        self.assertTrue(text.strip())
+        self.assertEqual(text, await adapter.read_text(DOCX_PATH))
+
+    async def test_pdf_read_ingested_parses_through_mmap(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path: str = os.path.join(temp_dir, "a.pdf")
+            with open(path, "wb") as file:
+                file.write(_minimal_pdf("Sentenca de primeiro grau"))
+
+            with ingest_file(path) as document:
+                text: str = await PdfAdapter().read_ingested(document)
+
+        self.assertIn("Sentenca de primeiro grau", text)
+
+    async def test_invalid_pdf_raises_io_error(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path: str = os.path.join(temp_dir, "a.pdf")
+            with open(path, "wb") as file:
+                file.write(b"isto nao e um pdf")
+
+            with ingest_file(path) as document, self.assertLogs("pypdf", "WARNING"):
+                with self.assertRaises(IOError):
+                    await PdfAdapter().read_ingested(document)
+
+
+if __name__ == "__main__":
+    unittest.main()
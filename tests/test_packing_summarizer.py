@@ -0,0 +1,55 @@
+import asyncio
+import unittest
+from typing import List, Optional
+
+from core.base_summarizer import BaseSummarizer
+from core.packing_summarizer import PackingSummarizer
+from exceptions import PackedResponseError
+
+
+class FakeSummarizer(BaseSummarizer):
+
+    def __init__(self, broken_ids: Optional[List[int]] = None, parse_error: bool = False) -> None:
+        self.broken_ids: List[int] = broken_ids or []
+        self.parse_error: bool = parse_error
+        self.calls: int = 0
+
+    async def summarize(self, text: str, prompt: Optional[str] = None) -> str:
+        self.calls += 1
+        return f"individual:{text}"
+
+    async def summarize_many(self, texts: List[str]) -> List[Optional[str]]:
+        self.calls += 1
+        if self.parse_error:
+            raise PackedResponseError("JSON inválido", len(texts))
+        return [None if i in self.broken_ids else f"lote:{text}" for i, text in enumerate(texts)]
+
+
+class PackingSummarizerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def _run(self, inner: FakeSummarizer, count: int) -> PackingSummarizer:
+        summarizer: PackingSummarizer = PackingSummarizer(inner, max_documents=10, linger_ms=10)
+        texts: List[str] = [f"doc{i}" for i in range(count)]
+
+        summaries: List[str] = await asyncio.gather(*(summarizer.summarize(text) for text in texts))
+
+        for text, summary in zip(texts, summaries):
+            self.assertTrue(summary.endswith(text))
+        return summarizer
+
+    async def test_packs_documents_into_few_requests(self) -> None:
+        inner: FakeSummarizer = FakeSummarizer()
+        summarizer: PackingSummarizer = await self._run(inner, 25)
+
+        self.assertEqual(inner.calls, 3)
+        self.assertIn("em 3 requisição(ões)", summarizer.packing_summary()[0])
+
+    async def test_request_count_includes_fallbacks(self) -> None:
+        for inner in (FakeSummarizer(broken_ids=[0, 4]), FakeSummarizer(parse_error=True)):
+            summarizer: PackingSummarizer = await self._run(inner, 25)
+
+            self.assertIn(f"em {inner.calls} requisição(ões)", summarizer.packing_summary()[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from typing import Optional
+
+from custom_types.cancellation_token import CancellationToken
+from utils.cancellation_util import run_cancellable
+from utils.profiler import Profiler
+
+SPIKE_BYTES: int = 8 * 1024 * 1024
+
+
+def _parse_spike(token: Optional[CancellationToken] = None) -> int:
+    # Pico curto entre amostras: alocado e liberado bem antes do próximo intervalo terminar.
+    size: int = len(bytearray(SPIKE_BYTES))
+    deadline: float = time.perf_counter() + 0.1
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+    return size
+
+
+def _summarize_busy() -> None:
+    deadline: float = time.perf_counter() + 0.1
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+class ProfilerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_report_and_collapsed_stacks_per_stage(self) -> None:
+        with tempfile.TemporaryDirectory() as output_dir:
+            profiler: Profiler = Profiler(output_dir, interval_ms=2, loop_lag_threshold_ms=1000)
+            profiler.start()
+
+            with profiler.document("a.pdf"):
+                with profiler.stage("parse"):
+                    await run_cancellable(_parse_spike)
+                with profiler.stage("summarize"):
+                    _summarize_busy()
+                await asyncio.sleep(0)
+
+            report_path: str = await profiler.stop()
+
+            with open(report_path, encoding="utf-8") as file:
+                report: str = file.read()
+            with open(os.path.join(output_dir, "profile.parse.collapsed"), encoding="utf-8") as file:
+                parse_stacks: str = file.read()
+            with open(os.path.join(output_dir, "profile.summarize.collapsed"), encoding="utf-8") as file:
+                summarize_stacks: str = file.read()
+            self.assertTrue(os.path.exists(os.path.join(output_dir, "profile.collapsed")))
+
+        self.assertIn("_parse_spike", parse_stacks)
+        self.assertNotIn("_summarize_busy", parse_stacks)
+        self.assertIn("_summarize_busy", summarize_stacks)
+        self.assertNotIn("_parse_spike", summarize_stacks)
+
+        self.assertIn("== Funções por etapa (tempo próprio) ==", report)
+        self.assertIn("parse (", report)
+        peak_line: str = next(line for line in report.splitlines() if line.endswith("a.pdf"))
+        self.assertGreaterEqual(float(peak_line.split()[0]), SPIKE_BYTES / 1024 / 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
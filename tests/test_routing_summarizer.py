@@ -0,0 +1,37 @@
+import types
+import unittest
+from typing import Any, Dict, List
+
+from core.routing_summarizer import RoutingSummarizer
+
+
+def _completion(content: str, finish_reason: str) -> Any:
+    message: Any = types.SimpleNamespace(content=content)
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message, finish_reason=finish_reason)])
+
+
+class RoutingSummarizerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_stream_escalates_truncated_small_model_reply(self) -> None:
+        summarizer: RoutingSummarizer = RoutingSummarizer(api_key="test")
+        calls: List[Dict[str, Any]] = []
+
+        async def create(**params: Any) -> Any:
+            calls.append(params)
+            self.assertFalse(params.get("stream"), "modelo menor não deve ser transmitido em streaming")
+            if params["model"] == summarizer.small_model:
+                return _completion("resumo cortad", "length")
+            return _completion("resumo completo", "stop")
+
+        summarizer.client.chat.completions.create = create
+
+        parts: List[str] = [delta async for delta in summarizer.summarize_stream("texto curto do despacho")]
+
+        self.assertEqual("".join(parts), "resumo completo")
+        self.assertEqual([call["model"] for call in calls], [summarizer.small_model, summarizer.large_model])
+        self.assertEqual(summarizer.routing_stats()[summarizer.large_model]["escalations"], 1)
+        await summarizer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,23 @@
+import unittest
+from pathlib import Path
+
+import config
+from custom_types.startup_report import StartupReport
+from utils.startup_util import measure_startup
+
+ROOT_DIR: Path = Path(__file__).resolve().parent.parent
+
+
+class StartupTest(unittest.TestCase):
+
+    def test_main_imports_within_budget(self) -> None:
+        # A primeira execução pode incluir a compilação dos .pyc, que não faz parte do orçamento.
+        measure_startup("main", config.STARTUP_BUDGET_MS, cwd=str(ROOT_DIR))
+        report: StartupReport = measure_startup("main", config.STARTUP_BUDGET_MS, cwd=str(ROOT_DIR))
+
+        self.assertEqual(report.heavy_modules, [], report.summary())
+        self.assertTrue(report.within_budget, report.summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import asyncio
+import os
+import socket
+import tempfile
+import unittest
+
+from services.document_service import DocumentService
+from services.summarization_server import SummarizationServer
+from tests.test_document_service import SlowStreamingSummarizer, TextAdapter
+
+
+class SummarizationServerTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.socket_path: str = os.path.join(self.temp_dir.name, "server.sock")
+        service: DocumentService = DocumentService(SlowStreamingSummarizer(), adapter=TextAdapter())
+        self.server: SummarizationServer = SummarizationServer(service=service, root_dir=self.temp_dir.name)
+
+    async def test_refuses_to_replace_regular_file(self) -> None:
+        with open(self.socket_path, "w", encoding="utf-8") as file:
+            file.write("dados")
+
+        with self.assertRaises(FileExistsError):
+            await self.server.start(unix_socket=self.socket_path)
+
+        with open(self.socket_path, encoding="utf-8") as file:
+            self.assertEqual(file.read(), "dados")
+
+    async def test_replaces_stale_socket(self) -> None:
+        stale: socket.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.socket_path)
+        stale.close()
+
+        await self.server.start(unix_socket=self.socket_path)
+        self.addAsyncCleanup(self.server.close)
+
+        _, writer = await asyncio.open_unix_connection(self.socket_path)
+        writer.close()
+        await writer.wait_closed()
+
+
+if __name__ == "__main__":
+    unittest.main()
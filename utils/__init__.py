@@ -1,10 +1,13 @@
 from typing import List
 
-from .chunck_util import chunk_text
+from .chunck_util import chunk_text, estimate_tokens
 from .file_utils import find_files
+from .single_flight import SingleFlight
 
 
 __all__: List[str] = [
     "chunk_text",
-    "find_files"
+    "estimate_tokens",
+    "find_files",
+    "SingleFlight"
 ]
\ No newline at end of file
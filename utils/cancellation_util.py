@@ -0,0 +1,19 @@
+import asyncio
+from functools import partial
+from typing import Any, Callable
+
+from custom_types import T
+from custom_types.cancellation_token import CancellationToken
+from utils.profiler import in_current_stage
+
+
+async def run_cancellable(func: Callable[..., T], *args: Any) -> T:
+    loop = asyncio.get_running_loop()
+    token: CancellationToken = CancellationToken()
+
+    try:
+        return await loop.run_in_executor(None, in_current_stage(partial(func, *args, token=token)))
+    except asyncio.CancelledError:
+        # A thread do executor não pode ser interrompida: sinaliza para que ela pare no próximo ponto de checagem.
+        token.cancel()
+        raise
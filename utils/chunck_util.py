@@ -9,4 +9,9 @@ def chunk_text(text: str, max_words: int = 600) -> List[str]:
     return [
         " ".join(words[i:i + max_words])
         for i in range(0, len(words), max_words)
-    ]
\ No newline at end of file
+    ]
+
+
+def estimate_tokens(text: str) -> int:
+    # Sem tokenizador no projeto: português fica em torno de 4 tokens a cada 3 palavras.
+    return (len(text.split()) * 4 + 2) // 3
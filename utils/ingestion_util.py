@@ -0,0 +1,50 @@
+import hashlib
+import mmap
+import os
+from mmap import mmap as MemoryMap
+from typing import Optional
+
+from custom_types.cancellation_token import CancellationToken
+from custom_types.ingested_file import IngestedFile
+
+_HASH_BLOCK_SIZE: int = 8 * 1024 * 1024
+
+
+def _hash_buffer(buffer: MemoryMap, token: Optional[CancellationToken]) -> str:
+    hasher = hashlib.sha256()
+    with memoryview(buffer) as view:
+        for offset in range(0, len(view), _HASH_BLOCK_SIZE):
+            if token:
+                token.raise_if_cancelled()
+            hasher.update(view[offset:offset + _HASH_BLOCK_SIZE])
+    return hasher.hexdigest()
+
+
+def ingest_file(file_path: str, token: Optional[CancellationToken] = None) -> IngestedFile:
+    with open(file_path, "rb") as file:
+        size: int = os.fstat(file.fileno()).st_size
+
+        if size == 0:
+            return IngestedFile(
+                file_path=file_path,
+                content_hash=hashlib.sha256(b"").hexdigest(),
+                size=0,
+            )
+
+        buffer: MemoryMap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if hasattr(buffer, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+        buffer.madvise(mmap.MADV_SEQUENTIAL)
+
+    try:
+        content_hash: str = _hash_buffer(buffer, token)
+    except BaseException:
+        buffer.close()
+        raise
+
+    return IngestedFile(
+        file_path=file_path,
+        content_hash=content_hash,
+        size=size,
+        buffer=buffer,
+    )
@@ -0,0 +1,345 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging import Logger
+from types import FrameType
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from custom_types import T
+
+logger: Logger = logging.getLogger(__name__)
+
+# Etapa ativa no contexto atual e, para o amostrador, por tarefa do loop ou por thread.
+_current_stage: ContextVar[Optional[str]] = ContextVar("profiler_stage", default=None)
+_active_stages: Dict[Hashable, str] = {}
+
+# Folhas que indicam thread ociosa (worker do executor sem tarefa ou loop em select).
+_IDLE_LEAVES: Tuple[Tuple[str, str], ...] = (
+    ("_worker", "thread.py"),
+    ("select", "selectors.py"),
+    ("wait", "threading.py"),
+)
+
+
+def _stage_owner() -> Hashable:
+    # No loop várias tarefas se alternam na mesma thread: a etapa pertence à tarefa.
+    try:
+        task: Optional[asyncio.Task] = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return task if task is not None else threading.get_ident()
+
+
+@contextmanager
+def _bind_stage(name: str) -> Iterator[None]:
+    owner: Hashable = _stage_owner()
+    previous: Optional[str] = _active_stages.get(owner)
+    token = _current_stage.set(name)
+    _active_stages[owner] = name
+    try:
+        yield
+    finally:
+        _current_stage.reset(token)
+        if previous is None:
+            _active_stages.pop(owner, None)
+        else:
+            _active_stages[owner] = previous
+
+
+def in_current_stage(func: Callable[[], T]) -> Callable[[], T]:
+    """Faz a thread que executar `func` ser atribuída à etapa ativa de quem a agendou."""
+    stage: Optional[str] = _current_stage.get()
+    if stage is None:
+        return func
+
+    def run() -> T:
+        with _bind_stage(stage):
+            return func()
+
+    return run
+
+
+class _SlowCallbackHandler(logging.Handler):
+
+    def __init__(self) -> None:
+        super().__init__(level=logging.WARNING)
+        self.records: List[Tuple[float, str]] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        message: str = record.getMessage()
+        if message.startswith("Executing ") and isinstance(record.args, tuple) and len(record.args) == 2:
+            self.records.append((float(record.args[1]), message))
+
+
+class Profiler:
+
+    def __init__(
+        self,
+        output_dir: str,
+        interval_ms: float = 5.0,
+        loop_lag_threshold_ms: float = 100.0,
+        top_n: int = 20,
+        trace_memory: bool = True,
+        include_idle: bool = False,
+    ) -> None:
+        self.output_dir: str = output_dir
+        self.interval_s: float = interval_ms / 1000
+        self.loop_lag_threshold_s: float = loop_lag_threshold_ms / 1000
+        self.top_n: int = top_n
+        self.trace_memory: bool = trace_memory
+        self.include_idle: bool = include_idle
+
+        self._stacks: Counter = Counter()
+        self._stage_stacks: Dict[str, Counter] = {}
+        self._sample_count: int = 0
+        self._stage_times: Dict[str, List[float]] = {}
+        self._document_peaks: Dict[str, int] = {}
+        self._document_overlaps: Dict[str, int] = {}
+        self._active_documents: Dict[str, List[int]] = {}
+        self._loop_lags: List[float] = []
+        self._lock: threading.Lock = threading.Lock()
+        self._stop_event: threading.Event = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._lag_task: Optional[asyncio.Task] = None
+        self._slow_callbacks: _SlowCallbackHandler = _SlowCallbackHandler()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._previous_slow_callback_duration: float = 0.1
+        self._started_at: float = 0.0
+        self._elapsed_s: float = 0.0
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._started_at = time.perf_counter()
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        self._previous_slow_callback_duration = self._loop.slow_callback_duration
+        self._loop.slow_callback_duration = self.loop_lag_threshold_s
+        self._loop.set_debug(True)
+        logging.getLogger("asyncio").addHandler(self._slow_callbacks)
+
+        self._stop_event.clear()
+        self._sampler = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+        self._sampler.start()
+        self._lag_task = self._loop.create_task(self._monitor_loop_lag())
+
+        logger.info(f"Profiling ativo (amostragem a cada {self.interval_s * 1000:.0f}ms)")
+
+    async def stop(self) -> str:
+        self._elapsed_s = time.perf_counter() - self._started_at
+        self._stop_event.set()
+
+        if self._lag_task:
+            self._lag_task.cancel()
+            await asyncio.gather(self._lag_task, return_exceptions=True)
+        if self._sampler:
+            self._sampler.join()
+
+        if self._loop:
+            self._loop.set_debug(False)
+            self._loop.slow_callback_duration = self._previous_slow_callback_duration
+        logging.getLogger("asyncio").removeHandler(self._slow_callbacks)
+
+        allocations: List[str] = self._top_allocations()
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        collapsed_path: str = os.path.join(self.output_dir, "profile.collapsed")
+        report_path: str = os.path.join(self.output_dir, "profile_report.txt")
+
+        self._write_collapsed(collapsed_path, self._stacks)
+        for stage, stacks in self._stage_stacks.items():
+            self._write_collapsed(os.path.join(self.output_dir, f"profile.{stage}.collapsed"), stacks)
+
+        with open(report_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(self._build_report(allocations)) + "\n")
+
+        logger.info(f"Perfil salvo em {collapsed_path} e {report_path}")
+        return report_path
+
+    @staticmethod
+    def _write_collapsed(path: str, stacks: Counter) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, count in stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start: float = time.perf_counter()
+        try:
+            with _bind_stage(name):
+                yield
+        finally:
+            with self._lock:
+                self._stage_times.setdefault(name, []).append(time.perf_counter() - start)
+
+    @contextmanager
+    def document(self, file_path: str) -> Iterator[None]:
+        if not self.trace_memory or not tracemalloc.is_tracing():
+            yield
+            return
+
+        # [memória no início, pico observado, maior nº de documentos simultâneos]
+        with self._lock:
+            # Antes de zerar o pico, repassa-o às janelas já abertas para que não o percam.
+            self._observe_peak()
+            tracemalloc.reset_peak()
+            current: int = tracemalloc.get_traced_memory()[0]
+            window: List[int] = [current, current, 0]
+            self._active_documents[file_path] = window
+            # O tracemalloc mede o processo todo: janelas sobrepostas dividem as mesmas alocações.
+            for active in self._active_documents.values():
+                active[2] = max(active[2], len(self._active_documents) - 1)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._observe_peak()
+                self._active_documents.pop(file_path, None)
+                peak: int = window[1] - window[0]
+                if peak >= self._document_peaks.get(file_path, 0):
+                    self._document_peaks[file_path] = peak
+                    self._document_overlaps[file_path] = window[2]
+
+    def _observe_peak(self) -> None:
+        # O pico do tracemalloc inclui picos entre amostras, que a leitura periódica perderia.
+        peak: int = tracemalloc.get_traced_memory()[1]
+        for window in self._active_documents.values():
+            window[1] = max(window[1], peak)
+
+    def _sample_loop(self) -> None:
+        own_id: int = threading.get_ident()
+        while not self._stop_event.wait(self.interval_s):
+            names: Dict[int, str] = {t.ident: t.name for t in threading.enumerate() if t.ident}
+            frames: Dict[int, FrameType] = sys._current_frames()
+
+            with self._lock:
+                for thread_id, frame in frames.items():
+                    if thread_id == own_id:
+                        continue
+                    if not self.include_idle and self._is_idle(frame):
+                        continue
+                    stack: str = self._collapse(names.get(thread_id, f"thread-{thread_id}"), frame)
+                    self._stacks[stack] += 1
+                    stage: Optional[str] = self._stage_of(thread_id)
+                    if stage:
+                        self._stage_stacks.setdefault(stage, Counter())[stack] += 1
+                self._sample_count += 1
+
+    def _stage_of(self, thread_id: int) -> Optional[str]:
+        if thread_id == self._loop_thread_id and self._loop:
+            task: Optional[asyncio.Task] = asyncio.current_task(self._loop)
+            return _active_stages.get(task) if task is not None else None
+        return _active_stages.get(thread_id)
+
+    @staticmethod
+    def _is_idle(frame: FrameType) -> bool:
+        code = frame.f_code
+        return (code.co_name, os.path.basename(code.co_filename)) in _IDLE_LEAVES
+
+    @staticmethod
+    def _collapse(thread_name: str, frame: Optional[FrameType]) -> str:
+        frames: List[str] = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        frames.append(thread_name)
+        return ";".join(reversed(frames))
+
+    async def _monitor_loop_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval: float = min(self.loop_lag_threshold_s / 2, 0.05)
+        while True:
+            expected: float = loop.time() + interval
+            await asyncio.sleep(interval)
+            lag: float = loop.time() - expected
+            if lag >= self.loop_lag_threshold_s:
+                self._loop_lags.append(lag)
+
+    def _top_allocations(self) -> List[str]:
+        if not self.trace_memory or not tracemalloc.is_tracing():
+            return []
+        snapshot: tracemalloc.Snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        return [str(stat) for stat in snapshot.statistics("lineno")[:self.top_n]]
+
+    @staticmethod
+    def _aggregate(stacks: Counter) -> Tuple[Counter, Counter]:
+        self_samples: Counter = Counter()
+        inclusive_samples: Counter = Counter()
+        for stack, count in stacks.items():
+            frames: List[str] = stack.split(";")[1:]
+            if not frames:
+                continue
+            self_samples[frames[-1]] += count
+            for frame in set(frames):
+                inclusive_samples[frame] += count
+        return self_samples, inclusive_samples
+
+    def _build_report(self, allocations: List[str]) -> List[str]:
+        lines: List[str] = [
+            f"Duração: {self._elapsed_s:.2f}s | Amostras: {self._sample_count} "
+            f"(intervalo {self.interval_s * 1000:.0f}ms)",
+            "",
+            "== Etapas ==",
+        ]
+        for name, times in sorted(self._stage_times.items(), key=lambda item: -sum(item[1])):
+            lines.append(
+                f"  {name:<12} n={len(times):<5} total={sum(times) * 1000:9.0f}ms "
+                f"média={sum(times) / len(times) * 1000:8.1f}ms máx={max(times) * 1000:8.1f}ms"
+            )
+
+        self_samples, inclusive_samples = self._aggregate(self._stacks)
+        total: int = max(sum(self._stacks.values()), 1)
+        lines.extend(["", f"== Top {self.top_n} funções (tempo próprio) =="])
+        for frame, count in self_samples.most_common(self.top_n):
+            lines.append(f"  {count / total * 100:5.1f}%  {count:7d}  {frame}")
+
+        lines.extend(["", f"== Top {self.top_n} funções (tempo inclusivo) =="])
+        for frame, count in inclusive_samples.most_common(self.top_n):
+            lines.append(f"  {count / total * 100:5.1f}%  {count:7d}  {frame}")
+
+        lines.extend(["", "== Funções por etapa (tempo próprio) =="])
+        for stage, stacks in sorted(self._stage_stacks.items(), key=lambda item: -sum(item[1].values())):
+            stage_total: int = sum(stacks.values())
+            lines.append(f"  {stage} ({stage_total} amostras, profile.{stage}.collapsed)")
+            for frame, count in self._aggregate(stacks)[0].most_common(min(self.top_n, 5)):
+                lines.append(f"    {count / stage_total * 100:5.1f}%  {count:7d}  {frame}")
+
+        lines.extend([
+            "",
+            f"== Top {self.top_n} documentos por pico de memória ==",
+            "  (pico exato do tracemalloc durante o documento; só é atribuível ao documento sem concorrência)",
+        ])
+        for file_path, peak in sorted(self._document_peaks.items(), key=lambda item: -item[1])[:self.top_n]:
+            overlap: int = self._document_overlaps.get(file_path, 0)
+            note: str = f"  [concorrente com até {overlap}]" if overlap else ""
+            lines.append(f"  {peak / 1024 / 1024:8.1f} MiB  {file_path}{note}")
+
+        lines.extend(["", f"== Top {self.top_n} alocações retidas ao final =="])
+        lines.extend(f"  {allocation}" for allocation in allocations)
+
+        lines.extend([
+            "",
+            f"== Latência do event loop (limite {self.loop_lag_threshold_s * 1000:.0f}ms) ==",
+            f"  Ocorrências: {len(self._loop_lags)} | "
+            f"Máx: {max(self._loop_lags, default=0.0) * 1000:.0f}ms",
+        ])
+        slowest: List[Tuple[float, str]] = sorted(self._slow_callbacks.records, reverse=True)
+        for _, message in slowest[:self.top_n]:
+            lines.append(f"  {message}")
+
+        return lines
@@ -0,0 +1,38 @@
+import json
+import os
+from typing import IO, Optional
+
+from custom_types.document_result import DocumentResult
+
+
+class JsonlResultWriter:
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self._file: Optional[IO[str]] = None
+
+    def open(self) -> "JsonlResultWriter":
+        directory: str = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        return self
+
+    def write(self, result: DocumentResult) -> None:
+        if not self._file:
+            raise RuntimeError("Arquivo de resultados não está aberto.")
+        self._file.write(json.dumps(result.to_dict(), ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "JsonlResultWriter":
+        return self.open()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
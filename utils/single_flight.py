@@ -0,0 +1,56 @@
+import asyncio
+from asyncio import Task
+from typing import Awaitable, Callable, Dict, Generic, Optional
+
+from custom_types import T
+
+
+class SingleFlight(Generic[T]):
+
+    def __init__(self) -> None:
+        self._in_flight: Dict[str, Task] = {}
+        self._waiters: Dict[Task, int] = {}
+
+    @property
+    def in_flight_count(self) -> int:
+        return len(self._in_flight)
+
+    def is_in_flight(self, key: str) -> bool:
+        return key in self._in_flight
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        task: Optional[Task] = self._in_flight.get(key)
+        if task is None:
+            # O trabalho compartilhado roda em uma tarefa própria: cancelar quem chegou
+            # primeiro não interrompe o processamento para os demais.
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            self._waiters[task] = 0
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        self._waiters[task] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._leave(key, task)
+
+    def _leave(self, key: str, task: Task) -> None:
+        remaining: int = self._waiters.get(task, 0) - 1
+        if remaining > 0:
+            self._waiters[task] = remaining
+            return
+
+        self._waiters.pop(task, None)
+        if not task.done():
+            # Último interessado saiu: ninguém mais aguarda o resultado.
+            if self._in_flight.get(key) is task:
+                del self._in_flight[key]
+            task.cancel()
+
+    def _forget(self, key: str, task: Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        self._waiters.pop(task, None)
+        if not task.cancelled():
+            # Evita o aviso "exception was never retrieved" quando ninguém aguardava.
+            task.exception()
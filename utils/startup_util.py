@@ -0,0 +1,58 @@
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from custom_types.startup_report import StartupReport
+
+HEAVY_MODULES: Tuple[str, ...] = ("faiss", "numpy", "openai", "pypdf", "docx")
+
+
+def _parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    timings: Dict[str, Tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields: List[str] = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name: str = fields[2].strip()
+        timings[name] = (int(fields[0]), int(fields[1]))
+    return timings
+
+
+def measure_startup(
+    module: str, budget_ms: float, top_n: int = 10, cwd: Optional[str] = None
+) -> StartupReport:
+    completed: subprocess.CompletedProcess = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+        cwd=cwd,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"Falha ao importar '{module}' para medir a inicialização:\n{completed.stderr}"
+        )
+
+    timings: Dict[str, Tuple[int, int]] = _parse_importtime(completed.stderr)
+    total_us: int = timings.get(module, (0, 0))[1]
+
+    heavy: List[str] = sorted(
+        {name.split(".")[0] for name in timings if name.split(".")[0] in HEAVY_MODULES}
+    )
+    slowest: List[Tuple[str, float]] = [
+        (name, cumulative / 1000)
+        for name, (_, cumulative) in sorted(
+            timings.items(), key=lambda item: item[1][1], reverse=True
+        )
+        if name != module
+    ][:top_n]
+
+    return StartupReport(
+        module=module,
+        total_ms=total_us / 1000,
+        budget_ms=budget_ms,
+        heavy_modules=heavy,
+        slowest_imports=slowest,
+    )